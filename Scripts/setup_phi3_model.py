@@ -5,23 +5,154 @@ For NotedCore Medical Transcription App
 
 This script downloads and prepares the Phi-3 Mini model for integration
 into the iOS app bundle for offline medical note generation.
+
+Pass --venv to install mlx-lm into a project virtual environment first.
 """
 
+import argparse
+import atexit
+import getpass
+import hashlib
+import importlib.util
 import os
 import sys
 import shutil
 import json
 from pathlib import Path
 import subprocess
-import tempfile
+import textwrap
+import venv
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Configuration
 MODEL_NAME = "mlx-community/Phi-3-mini-4k-instruct-4bit"
 PROJECT_ROOT = Path(__file__).parent.parent
 XCODE_PROJECT_PATH = PROJECT_ROOT / "NotedCore"
 MODELS_DIR = XCODE_PROJECT_PATH / "Models"
+VENV_DIR = PROJECT_ROOT / "venv"
+VENV_SENTINEL = VENV_DIR / ".notedcore_ready"
+STATE_FILE = Path.home() / ".cache" / "notedcore" / "setup_state.json"
+# Everything mlx_lm.load needs from the snapshot, skipping READMEs and other formats
+ALLOW_PATTERNS = ["*.json", "*.safetensors", "tokenizer.model"]
+DOWNLOAD_WORKERS = 8
+MANIFEST_FILE = MODELS_DIR / "phi3.sha256"
+HASH_CHUNK_SIZE = 8 * 1024 * 1024
+# hf_transfer fetches the weights over parallel ranged GETs
+REQUIREMENTS = ["mlx-lm", "hf_transfer"]
+WHEELS_DIR = PROJECT_ROOT / "Scripts" / "wheels"
+LOCK_FILE = WHEELS_DIR / "requirements.lock"
+PIP_FLAGS = ["--disable-pip-version-check", "--no-input", "--prefer-binary"]
+
+def dump_json(obj):
+    """Serialize a small info/state dict to indented JSON bytes."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode()
 
-def check_requirements():
+def venv_stamp(python_path):
+    """Describe what a ready venv was built from and what it contains."""
+    mlx_lm_version = None
+    site_packages = venv_site_packages(python_path)
+    if site_packages:
+        for dist_info in site_packages.glob("mlx_lm-*.dist-info"):
+            mlx_lm_version = dist_info.name[len("mlx_lm-"):-len(".dist-info")]
+    
+    # The venv's own interpreter, which is not necessarily the one running this script
+    config = read_pyvenv_cfg(python_path) or {}
+    python = [config.get("version_info") or config.get("version"), config.get("executable") or config.get("home")]
+    
+    lock_digest = file_sha256(LOCK_FILE) if LOCK_FILE.exists() else None
+    return {"python": python, "mlx_lm": mlx_lm_version, "lock": lock_digest}
+
+def setup_virtual_environment():
+    """Create and activate virtual environment."""
+    print("🔧 Setting up virtual environment...")
+    
+    if not VENV_DIR.exists():
+        print(f"   Creating virtual environment at: {VENV_DIR}")
+        # uv installs without pip, so skip the ensurepip bootstrap when it is available
+        venv.create(VENV_DIR, with_pip=shutil.which("uv") is None)
+    
+    # Get paths for the virtual environment
+    bin_dir = VENV_DIR / ("Scripts" if sys.platform == "win32" else "bin")
+    pip_path = bin_dir / "pip"
+    python_path = bin_dir / "python"
+    
+    # A venv stamped for its current interpreter and this lock file needs no pip at all
+    try:
+        stamp = json.loads(VENV_SENTINEL.read_bytes())
+    except (OSError, ValueError):
+        stamp = {}
+    expected = venv_stamp(python_path)
+    ready = (stamp.get("mlx_lm") is not None and stamp.get("python") == expected["python"]
+             and stamp.get("lock") == expected["lock"])
+    if ready:
+        print(f"✅ Virtual environment ready (mlx-lm {stamp['mlx_lm']})")
+    
+    return str(python_path), str(pip_path), ready
+
+def locked_requirement_args():
+    """Install arguments for the pinned lock file, offline when its wheels are present."""
+    if not LOCK_FILE.exists():
+        return None
+    
+    args = ["-r", str(LOCK_FILE)]
+    if any(WHEELS_DIR.glob("*.whl")):
+        # Exact pins plus local wheels: no index lookups and no backtracking
+        args = ["--no-index", "--find-links", str(WHEELS_DIR)] + args
+    return args
+
+def install_requirements(pip_path, python_path=None):
+    """Install required packages in virtual environment."""
+    print("📦 Installing required packages...")
+    
+    # One resolver pass; uv resolves far faster than pip when it is available
+    uv_path = shutil.which("uv")
+    lock_args = locked_requirement_args()
+    if uv_path and python_path:
+        command = [uv_path, "pip", "install", "--python", python_path, *(lock_args or ["-U", *REQUIREMENTS])]
+    elif lock_args:
+        command = [pip_path, "install", *PIP_FLAGS, *lock_args]
+    else:
+        command = [pip_path, "install", "-U", *PIP_FLAGS, "pip", *REQUIREMENTS]
+    
+    try:
+        print("   Installing mlx-lm...")
+        subprocess.check_call(command)
+        
+        if python_path:
+            VENV_SENTINEL.write_bytes(dump_json(venv_stamp(python_path)))
+        
+        print("✅ All packages installed successfully")
+        return True
+        
+    except subprocess.CalledProcessError as e:
+        print(f"❌ Failed to install packages: {e}")
+        return False
+
+def load_setup_state():
+    """Load cached setup decisions from previous runs."""
+    try:
+        return json.loads(STATE_FILE.read_bytes())
+    except (OSError, ValueError):
+        return {}
+
+def save_setup_state(state):
+    """Persist cached setup decisions for the next run."""
+    try:
+        STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        STATE_FILE.write_bytes(dump_json(state))
+    except OSError:
+        pass
+
+def check_requirements(python_path=None):
     """Check if required tools are installed."""
     print("🔍 Checking requirements...")
     
@@ -30,19 +161,39 @@ def check_requirements():
         print("❌ Python 3.8+ required")
         return False
     
+    # Skip the import probe when this interpreter already passed it
+    python_path = str(python_path or sys.executable)
+    mtime = Path(python_path).stat().st_mtime
+    state = load_setup_state()
+    interpreters = state.get("interpreters", {})
+    cached = interpreters.get(python_path, {})
+    if cached.get("mlx_lm_ok") and cached.get("mtime") == mtime:
+        print("✅ mlx-lm is installed (cached)")
+        return True
+    
     # Check if mlx-lm is installed
-    try:
-        import mlx_lm
-        print("✅ mlx-lm is installed")
-    except ImportError:
-        print("❌ mlx-lm not found. Installing...")
+    if python_path == sys.executable:
+        try:
+            import mlx_lm
+            print("✅ mlx-lm is installed")
+        except ImportError:
+            print("❌ mlx-lm not found. Installing...")
+            try:
+                subprocess.check_call([sys.executable, "-m", "pip", "install", *PIP_FLAGS, *REQUIREMENTS])
+                print("✅ mlx-lm installed successfully")
+            except subprocess.CalledProcessError:
+                print("❌ Failed to install mlx-lm")
+                return False
+    else:
         try:
-            subprocess.check_call([sys.executable, "-m", "pip", "install", "mlx-lm"])
-            print("✅ mlx-lm installed successfully")
+            subprocess.check_output([python_path, "-c", "import mlx_lm"])
+            print("✅ mlx-lm is installed")
         except subprocess.CalledProcessError:
-            print("❌ Failed to install mlx-lm")
+            print("❌ mlx-lm not found in virtual environment")
             return False
     
+    interpreters[python_path] = {"mtime": mtime, "mlx_lm_ok": True}
+    save_setup_state({**state, "interpreters": interpreters})
     return True
 
 def create_models_directory():
@@ -51,82 +202,337 @@ def create_models_directory():
     MODELS_DIR.mkdir(exist_ok=True)
     print(f"✅ Models directory: {MODELS_DIR}")
 
-def download_model():
+def read_pyvenv_cfg(python_path):
+    """Return the settings in a venv's pyvenv.cfg, or None if it has none."""
+    venv_root = Path(python_path).parent.parent
+    try:
+        with open(venv_root / "pyvenv.cfg", 'r') as f:
+            config = dict(line.split("=", 1) for line in f if "=" in line)
+    except OSError:
+        return None
+    
+    return {key.strip(): value.strip() for key, value in config.items()}
+
+def venv_site_packages(python_path):
+    """Return the venv's site-packages as its own interpreter reports it, or None."""
+    try:
+        output = subprocess.check_output(
+            [str(python_path), "-c", "import sysconfig; print(sysconfig.get_path('purelib'))"], text=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    
+    return Path(output.strip())
+
+def venv_matches_running_python(python_path):
+    """Return True if the venv was built for the Python running this script."""
+    config = read_pyvenv_cfg(python_path) or {}
+    version = config.get("version_info") or config.get("version", "")
+    return version.split(".")[:2] == [str(sys.version_info.major), str(sys.version_info.minor)]
+
+def configure_http_session():
+    """Send every hub request through one keep-alive session sized for the download workers."""
+    try:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from huggingface_hub import configure_http_backend, constants
+    except ImportError:
+        # huggingface_hub >= 1.0 has no requests backend and already shares one httpx client
+        return False
+    
+    # Offline runs keep the hub's own session, which refuses to touch the network
+    if constants.HF_HUB_OFFLINE:
+        return False
+    
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=DOWNLOAD_WORKERS, pool_maxsize=DOWNLOAD_WORKERS)
+    session.mount("https://", adapter)
+    configure_http_backend(backend_factory=lambda: session)
+    return True
+
+def enable_hf_transfer():
+    """Turn on the hf_transfer downloader if it is installed."""
+    if importlib.util.find_spec("hf_transfer") is None:
+        return False
+    
+    os.environ.setdefault("HF_HUB_ENABLE_HF_TRANSFER", "1")
+    # huggingface_hub reads the flag at import time; mlx_lm may have imported it already
+    constants = sys.modules.get("huggingface_hub.constants")
+    if constants is not None and hasattr(constants, "HF_HUB_ENABLE_HF_TRANSFER"):
+        constants.HF_HUB_ENABLE_HF_TRANSFER = os.environ["HF_HUB_ENABLE_HF_TRANSFER"] == "1"
+    return True
+
+def download_model(python_path=None):
     """Download Phi-3 Mini model using mlx-lm."""
     print(f"⬇️ Downloading {MODEL_NAME}...")
     print("   This may take several minutes depending on your internet connection...")
     
+    if python_path:
+        # Import the venv's mlx-lm here rather than paying for a second interpreter,
+        # which only works when the venv was built for this Python
+        site_packages = venv_site_packages(python_path) if venv_matches_running_python(python_path) else None
+        if site_packages is None:
+            return download_model_in_venv(python_path)
+        sys.path.insert(0, str(site_packages))
+    
+    enable_hf_transfer()
+    
     try:
-        from mlx_lm import load
+        from huggingface_hub import constants, snapshot_download
         
-        # Download model to temporary directory first
-        with tempfile.TemporaryDirectory() as temp_dir:
-            print(f"   Downloading to temporary directory: {temp_dir}")
-            
-            # Load model (this triggers download)
-            model, tokenizer = load(MODEL_NAME)
-            
-            # The model files are now cached in ~/.cache/huggingface/hub/
-            # We need to copy them to our project
-            
-            print("✅ Model downloaded successfully")
-            return True
+        print(f"   hf_transfer enabled: {getattr(constants, 'HF_HUB_ENABLE_HF_TRANSFER', False)}")
+        
+        # Fetch only what MLX needs, several files in parallel over pooled connections
+        configure_http_session()
+        snapshot_path = snapshot_download(MODEL_NAME, allow_patterns=ALLOW_PATTERNS,
+                                          max_workers=DOWNLOAD_WORKERS, etag_timeout=30)
+        
+        print("✅ Model downloaded successfully")
+        return Path(snapshot_path)
             
     except Exception as e:
         print(f"❌ Failed to download model: {e}")
-        return False
+        return None
+
+# Runs inside a venv built for another Python; the last stdout line is a JSON status
+DOWNLOAD_SCRIPT = textwrap.dedent('''
+    import importlib.util
+    import json
+    import os
+    import sys
+    if importlib.util.find_spec("hf_transfer") is not None:
+        os.environ.setdefault("HF_HUB_ENABLE_HF_TRANSFER", "1")
+    try:
+        from huggingface_hub import snapshot_download
+        sys.path.insert(0, {scripts_dir!r})
+        from setup_phi3_model import configure_http_session
+        configure_http_session()
+        snapshot_path = snapshot_download({model_name!r}, allow_patterns={allow_patterns!r},
+                                          max_workers={max_workers}, etag_timeout=30)
+        info = {{"status": "success", "snapshot": snapshot_path}}
+    except Exception as e:
+        info = {{"status": "error", "message": str(e)}}
+    print(json.dumps(info))
+''')
+
+def download_model_in_venv(python_path):
+    """Download Phi-3 Mini model in a venv built for a different Python."""
+    script = DOWNLOAD_SCRIPT.format(model_name=MODEL_NAME, allow_patterns=ALLOW_PATTERNS,
+                                    max_workers=DOWNLOAD_WORKERS, scripts_dir=str(Path(__file__).parent))
+    # stderr stays attached so download progress is still shown
+    result = subprocess.run([python_path, "-c", script], stdout=subprocess.PIPE, text=True)
+    
+    try:
+        info = json.loads(result.stdout.splitlines()[-1])
+    except (IndexError, ValueError):
+        print(f"❌ Failed to download model (exit code {result.returncode})")
+        return None
+    
+    if info["status"] != "success":
+        print(f"❌ Model download failed: {info.get('message', 'Unknown error')}")
+        return None
+    
+    print("✅ Model downloaded successfully")
+    return Path(info["snapshot"])
+
+# RAM disk size in 512-byte sectors (4 GiB, enough for the 4-bit weights)
+RAM_DISK_SECTORS = 4096 * 2048
 
-def find_model_files():
+def setup_tmpfs_cache():
+    """Point the HuggingFace cache at a RAM disk for the download and copy."""
+    print("🧠 Staging HuggingFace cache in RAM...")
+    
+    try:
+        if sys.platform == "darwin":
+            device = subprocess.check_output(
+                ["hdiutil", "attach", "-nomount", f"ram://{RAM_DISK_SECTORS}"]
+            ).decode().strip()
+            subprocess.check_call(["diskutil", "erasevolume", "HFS+", "hfcache", device],
+                                  stdout=subprocess.DEVNULL)
+            atexit.register(subprocess.call, ["hdiutil", "detach", device],
+                            stdout=subprocess.DEVNULL)
+            cache_root = Path("/Volumes/hfcache") / "hf"
+        elif sys.platform.startswith("linux") and Path("/dev/shm").is_dir():
+            cache_root = Path("/dev/shm") / f"hf-{getpass.getuser()}"
+            atexit.register(shutil.rmtree, cache_root, ignore_errors=True)
+        else:
+            print("⚠️  No RAM disk support on this platform, using the default cache")
+            return None
+        
+        cache_root.mkdir(parents=True, exist_ok=True)
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"⚠️  Could not create RAM disk ({e}), using the default cache")
+        return None
+    
+    os.environ["HF_HOME"] = str(cache_root)
+    print(f"✅ HuggingFace cache: {cache_root}")
+    return cache_root
+
+def find_model_files(snapshot_path=None):
     """Find the downloaded model files in the HuggingFace cache."""
     print("🔍 Locating model files...")
     
-    # HuggingFace cache directory
-    cache_dir = Path.home() / ".cache" / "huggingface" / "hub"
+    # snapshot_download already told us which revision it fetched
+    if snapshot_path and Path(snapshot_path).is_dir():
+        print(f"✅ Found model files in: {snapshot_path}")
+        return Path(snapshot_path)
     
-    # Look for Phi-3 model directory
-    model_dirs = list(cache_dir.glob("models--mlx-community--Phi-3-mini-4k-instruct-4bit"))
+    # HuggingFace cache directory (HF_HOME may point at a RAM disk)
+    hf_home = os.environ.get("HF_HOME", Path.home() / ".cache" / "huggingface")
+    cache_dir = Path(hf_home) / "hub"
     
-    if not model_dirs:
+    # refs/main names the snapshot the hub last resolved for this repo
+    ref_file = cache_dir / f"models--{MODEL_NAME.replace('/', '--')}" / "refs" / "main"
+    try:
+        snapshot_hash = ref_file.read_text().strip()
+    except OSError:
         print("❌ Model cache directory not found")
         return None
     
-    model_dir = model_dirs[0] / "snapshots"
-    
-    # Get the latest snapshot
-    snapshot_dirs = list(model_dir.iterdir())
-    if not snapshot_dirs:
+    latest_snapshot = ref_file.parent.parent / "snapshots" / snapshot_hash
+    if not latest_snapshot.is_dir():
         print("❌ No model snapshots found")
         return None
     
-    latest_snapshot = max(snapshot_dirs, key=lambda p: p.stat().st_mtime)
     print(f"✅ Found model files in: {latest_snapshot}")
     
     return latest_snapshot
 
-def copy_model_files(source_dir):
-    """Copy model files to Xcode project."""
-    print("📋 Copying model files to Xcode project...")
+# Linux ioctl number for FICLONE (_IOW(0x94, 9, int))
+FICLONE = 0x40049409
+
+def fast_copy(source_path, dest_path):
+    """Copy a file using a copy-on-write clone or sendfile where available."""
+    src, dst = str(source_path), str(dest_path)
+    
+    if sys.platform == "darwin":
+        # APFS clonefile: metadata-only until either side is modified
+        try:
+            subprocess.run(["cp", "-c", src, dst], check=True, capture_output=True)
+            return
+        except (OSError, subprocess.CalledProcessError):
+            pass
+    elif sys.platform.startswith("linux"):
+        import fcntl
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                try:
+                    # Btrfs/XFS reflink
+                    fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+                except OSError:
+                    # Kernel-side copy without a userspace buffer
+                    offset = 0
+                    remaining = os.fstat(fsrc.fileno()).st_size
+                    while remaining > 0:
+                        sent = os.sendfile(fdst.fileno(), fsrc.fileno(), offset, remaining)
+                        if sent == 0:
+                            break
+                        offset += sent
+                        remaining -= sent
+            shutil.copystat(src, dst)
+            return
+        except OSError:
+            pass
+    
+    shutil.copy2(src, dst)
+
+def drop_page_cache(path, written=False):
+    """Ask the kernel to evict a file's pages once this script is done with it."""
+    # macOS copies are APFS clones, so only Linux has pages worth dropping
+    if not hasattr(os, "posix_fadvise"):
+        return
+    
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        if written:
+            # Dirty pages cannot be dropped until they reach the disk
+            os.fdatasync(fd)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def link_model_file(source_path, dest_path, allow_links=True):
+    """Link a cached model file into the project instead of copying its bytes."""
+    # Snapshot entries are symlinks into the HF blob store; link the blob itself
+    target = Path(source_path).resolve()
+    if dest_path.is_symlink() or dest_path.exists():
+        dest_path.unlink()
+    
+    if not allow_links:
+        fast_copy(target, dest_path)
+        drop_page_cache(target)
+        drop_page_cache(dest_path, written=True)
+        return "Copied"
+    
+    # Same volume: a hardlink is a real file to Xcode and survives cache cleanup
+    if target.stat().st_dev == dest_path.parent.stat().st_dev:
+        try:
+            os.link(target, dest_path)
+            return "Hardlinked"
+        except OSError:
+            pass
+    
+    # Windows without developer mode cannot symlink
+    if sys.platform != "win32":
+        try:
+            os.symlink(target, dest_path)
+            return "Linked"
+        except OSError:
+            pass
+    
+    fast_copy(target, dest_path)
+    drop_page_cache(target)
+    drop_page_cache(dest_path, written=True)
+    return "Copied"
+
+def copy_model_files(source_dir, allow_links=True):
+    """Link model files from the HuggingFace cache into the Xcode project."""
+    print("📋 Linking model files into Xcode project...")
     
-    # Required files
-    required_files = {
+    # Files to copy with their mappings
+    file_mappings = {
         "config.json": "phi-3-config.json",
-        "tokenizer.json": "phi-3-tokenizer.json", 
-        "model.safetensors": "phi-3-mini.mlx",
+        "tokenizer.json": "phi-3-tokenizer.json",
         "tokenizer_config.json": "phi-3-tokenizer-config.json"
     }
     
-    copied_files = []
+    # Find the weights file (could be .safetensors or .npz)
+    weights_files = list(source_dir.glob("*.safetensors")) + list(source_dir.glob("*.npz"))
+    if weights_files:
+        # Use the first weights file found
+        weights_file = weights_files[0]
+        file_mappings[weights_file.name] = "phi-3-mini.mlx"
     
-    for source_file, dest_file in required_files.items():
+    tasks = []
+    for source_file, dest_file in file_mappings.items():
         source_path = source_dir / source_file
-        dest_path = MODELS_DIR / dest_file
-        
         if source_path.exists():
-            shutil.copy2(source_path, dest_path)
-            print(f"✅ Copied: {source_file} -> {dest_file}")
-            copied_files.append(dest_file)
+            tasks.append((source_path, MODELS_DIR / dest_file))
         else:
-            print(f"⚠️  File not found: {source_file}")
+            print(f"⚠️  File not found: {source_path}")
+    
+    # Copy any additional MLX files
+    mapped_names = set(file_mappings.values())
+    for mlx_file in source_dir.glob("*.mlx*"):
+        if mlx_file.name not in mapped_names:
+            tasks.append((mlx_file, MODELS_DIR / mlx_file.name))
+    
+    if not tasks:
+        return []
+    
+    # Overlap the large weights file with the small JSON files
+    with ThreadPoolExecutor(max_workers=min(4, len(tasks))) as executor:
+        actions = list(executor.map(lambda task: link_model_file(*task, allow_links), tasks))
+    
+    # Placed file name -> the cache file it came from, whose blob name gives its hash
+    copied_files = {}
+    for (source_path, dest_path), action in zip(tasks, actions):
+        print(f"✅ {action}: {source_path.name} -> {dest_path.name}")
+        copied_files[dest_path.name] = source_path
     
     return copied_files
 
@@ -167,22 +573,133 @@ def create_model_info():
         "source": MODEL_NAME,
         "license": "MIT",
         "intended_use": "Medical note generation",
-        "setup_date": subprocess.check_output(["date", "+%Y-%m-%d"]).decode().strip()
+        "setup_date": date.today().isoformat()
     }
     
     info_file = MODELS_DIR / "model_info.json"
-    with open(info_file, 'w') as f:
-        json.dump(model_info, f, indent=2)
+    info_file.write_bytes(dump_json(model_info))
     
     print(f"✅ Created model info: {info_file}")
 
-def main():
+def write_model_pointer(source_dir):
+    """Record the cache snapshot location instead of placing the model files."""
+    pointer_file = MODELS_DIR / "model_path.json"
+    pointer_file.write_bytes(dump_json({"snapshot": str(Path(source_dir).resolve())}))
+    
+    print(f"✅ Model pointer: {pointer_file} -> {source_dir}")
+    return pointer_file
+
+def file_sha256(path, trust_blob_names=True):
+    """Hash a model file, reusing the HF cache blob name when it is already a SHA-256."""
+    target = Path(path).resolve()
+    # LFS blobs in the hub cache are stored under their SHA-256
+    if trust_blob_names and target.parent.name == "blobs" and len(target.name) == 64:
+        return target.name
+    
+    digest = hashlib.sha256()
+    with open(target, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    drop_page_cache(target)
+    return digest.hexdigest()
+
+def write_manifest(paths, sources=None):
+    """Record the SHA-256 of every placed file so re-runs can skip setup."""
+    paths = [Path(p) for p in paths]
+    # Hashing the cache files the paths were placed from reads the digest off their
+    # blob names, where a copied or hardlinked file would be read in full
+    with ThreadPoolExecutor(max_workers=min(4, len(paths))) as executor:
+        digests = list(executor.map(file_sha256, sources or paths))
+    
+    lines = []
+    for path, digest in zip(paths, digests):
+        name = path.name if path.parent == MODELS_DIR else str(path)
+        lines.append(f"{digest}  {name}")
+    MANIFEST_FILE.write_text("\n".join(lines) + "\n")
+    print(f"✅ Wrote manifest: {MANIFEST_FILE}")
+
+def model_files_current(pointer, verify=False):
+    """Check whether a previous setup left every file in place and unchanged."""
+    try:
+        lines = MANIFEST_FILE.read_text().splitlines()
+        manifest_mtime = MANIFEST_FILE.stat().st_mtime
+    except OSError:
+        return False
+    
+    entries = [line.split("  ", 1) for line in lines if line.strip()]
+    # A manifest from the other mode does not cover what was asked for
+    if ("model_path.json" if pointer else "phi-3-mini.mlx") not in {name for _, name in entries}:
+        return False
+    
+    for digest, name in entries:
+        path = MODELS_DIR / name
+        try:
+            modified = path.stat().st_mtime
+        except OSError:
+            return False
+        
+        if verify:
+            if file_sha256(path, trust_blob_names=False) != digest:
+                return False
+        elif modified > manifest_mtime:
+            return False
+    
+    return True
+
+def print_venv_tip(used_venv):
+    """Remind the user where the virtual environment lives."""
+    if used_venv:
+        print("\n💡 Tip: The virtual environment is at:", VENV_DIR)
+        print("   You can activate it with: source venv/bin/activate")
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Set up the Phi-3 Mini model for NotedCore")
+    parser.add_argument("--venv", action="store_true",
+                        help=f"Install mlx-lm into a virtual environment at {VENV_DIR}")
+    parser.add_argument("--pointer", action="store_true",
+                        help="Only write NotedCore/Models/model_path.json pointing at the "
+                             "HuggingFace cache snapshot; the app does not read it yet")
+    parser.add_argument("--ram-cache", action="store_true",
+                        help="Stage the HuggingFace cache on a RAM disk (places the files, "
+                             "ignoring --pointer)")
+    parser.add_argument("--force", action="store_true",
+                        help="Re-run setup even if the manifest says the files are current")
+    parser.add_argument("--verify", action="store_true",
+                        help="Re-hash files against the manifest instead of comparing mtimes")
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """Main setup function."""
+    args = parse_args(argv)
+    
     print("🏥 NotedCore Medical Transcription - Phi-3 Mini Setup")
     print("="*60)
     
+    # Skip everything, network included, when a previous run is still intact
+    # The app loads Models/phi-3-mini.mlx, so files are placed unless a pointer is asked for;
+    # a RAM disk cache disappears on exit, so its files are always copied out
+    pointer = args.pointer and not args.ram_cache
+    if not args.force and model_files_current(pointer, args.verify):
+        print("✅ Model files are already in place and unchanged")
+        print("   Re-run with --force to set them up again.")
+        return 0
+    
+    # Set HF_HOME before huggingface_hub is imported
+    ram_cache = setup_tmpfs_cache() if args.ram_cache else None
+    
+    python_path = None
+    if args.venv:
+        # Setup virtual environment
+        python_path, pip_path, venv_ready = setup_virtual_environment()
+        
+        # Install requirements
+        if not venv_ready and not install_requirements(pip_path, python_path):
+            print("❌ Setup failed - could not install requirements")
+            return 1
+    
     # Check requirements
-    if not check_requirements():
+    if not check_requirements(python_path):
         print("❌ Setup failed - requirements not met")
         return 1
     
@@ -190,22 +707,36 @@ def main():
     create_models_directory()
     
     # Download model
-    if not download_model():
+    snapshot_path = download_model(python_path)
+    if not snapshot_path:
         print("❌ Setup failed - model download failed")
         return 1
     
     # Find model files
-    model_dir = find_model_files()
+    model_dir = find_model_files(snapshot_path)
     if not model_dir:
         print("❌ Setup failed - model files not found")
         return 1
     
+    # Opt-in: record where the snapshot is instead of copying it
+    if pointer:
+        pointer_file = write_model_pointer(model_dir)
+        write_manifest([pointer_file] + [p for p in sorted(model_dir.iterdir()) if p.is_file()])
+        create_model_info()
+        print("\n✅ Model pointer written")
+        print("   Nothing in NotedCore reads model_path.json yet; the app still loads")
+        print("   Models/phi-3-mini.mlx. Re-run without --pointer to place the files.")
+        print_venv_tip(args.venv)
+        return 0
+    
     # Copy files
-    copied_files = copy_model_files(model_dir)
+    copied_files = copy_model_files(model_dir, allow_links=ram_cache is None)
     if not copied_files:
         print("❌ Setup failed - no files copied")
         return 1
     
+    write_manifest([MODELS_DIR / name for name in copied_files], list(copied_files.values()))
+    
     # Create model info
     create_model_info()
     
@@ -214,6 +745,7 @@ def main():
     
     print("\n✅ Setup completed successfully!")
     print("   Follow the Xcode instructions above to complete the integration.")
+    print_venv_tip(args.venv)
     
     return 0
 
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Phi-3 Setup Script Tests
+========================
+
+Tests for the virtual environment checks in setup_phi3_model.py.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+import venv
+from pathlib import Path
+
+# Add this directory to path for imports
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+import setup_phi3_model
+
+class TestVenvStamp(unittest.TestCase):
+    """Test how a ready virtual environment is recognised"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.venv_dir = Path(self.temp_dir.name) / "venv"
+        venv.create(self.venv_dir, with_pip=False)
+        bin_dir = self.venv_dir / ("Scripts" if sys.platform == "win32" else "bin")
+        self.python_path = bin_dir / "python"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _set_venv_version(self, version):
+        """Rewrite the version recorded in the venv's pyvenv.cfg"""
+        cfg_path = self.venv_dir / "pyvenv.cfg"
+        lines = [f"version_info = {version}" if line.startswith(("version", "version_info")) else line
+                 for line in cfg_path.read_text().splitlines()]
+        cfg_path.write_text("\n".join(lines) + "\n")
+
+    def test_stamp_with_mismatched_python_version(self):
+        """Test that mlx-lm is found in a venv built for another Python version"""
+        site_packages = setup_phi3_model.venv_site_packages(self.python_path)
+        (site_packages / "mlx_lm-0.30.2.dist-info").mkdir(parents=True)
+
+        self._set_venv_version("3.99.1.final.0")
+
+        stamp = setup_phi3_model.venv_stamp(self.python_path)
+        self.assertEqual(stamp["mlx_lm"], "0.30.2")
+        self.assertEqual(stamp["python"][0], "3.99.1.final.0")
+        self.assertFalse(setup_phi3_model.venv_matches_running_python(self.python_path))
+
+    def test_stamp_with_matching_python_version(self):
+        """Test that a venv for the running Python can be imported from directly"""
+        self.assertTrue(setup_phi3_model.venv_matches_running_python(self.python_path))
+        self.assertIsNone(setup_phi3_model.venv_stamp(self.python_path)["mlx_lm"])
+
+if __name__ == "__main__":
+    unittest.main()
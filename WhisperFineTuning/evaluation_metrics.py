@@ -19,26 +19,177 @@ This evaluation framework ensures that fine-tuned models achieve clinical-grade
 accuracy suitable for healthcare applications.
 """
 
+import os
 import re
+import sys
+import math
 import json
 import logging
+from functools import lru_cache
+from operator import attrgetter
 from typing import List, Dict, Tuple, Set, Optional, Union
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict, is_dataclass
 from collections import defaultdict, Counter
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import numpy as np
 from sklearn.metrics import precision_recall_fscore_support
-import nltk
-from nltk.translate.bleu_score import sentence_bleu, SmoothingFunction
-from nltk.metrics import distance
-from nltk.tokenize import word_tokenize
+from rapidfuzz.distance import Levenshtein
 
-from medical_vocabulary import MedicalVocabularyEnhancer
+from medical_vocabulary import MedicalVocabularyEnhancer, TermMatcher
+
+# Fast JSON serialization for evaluation reports
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Spelled-out units and their abbreviations
+UNIT_MAPPINGS = {
+    'milligrams': 'mg',
+    'milligram': 'mg',
+    'milliliters': 'ml',
+    'milliliter': 'ml',
+    'micrograms': 'mcg',
+    'microgram': 'mcg',
+    'kilograms': 'kg',
+    'kilogram': 'kg'
+}
+
+# Common medical term variations
+MEDICAL_MAPPINGS = {
+    'heart attack': 'myocardial infarction',
+    'high blood pressure': 'hypertension',
+    'sugar diabetes': 'diabetes mellitus'
+}
+
+# Word tokenizer matching the Treebank splits that matter for transcripts: numbers
+# keep their decimals, ratios, times and ranges ("2.5mg", "140/90", "10:30", "3-4"),
+# dotted abbreviations stay whole ("q.i.d"), hyphenated and slashed words stay whole
+# ("x-ray", "beta-blocker", "mg/kg"), and contractions split ("does", "n't")
+TOKEN_RE = re.compile(r"\d+(?:[.,/:-]\d+)*\w*(?:[-/]\w+)*|\w+(?:\.\w+)+|\w+(?:[-/]\w+)+"
+                      r"|\w+(?=n't\b)|n't\b|'\w+|\w+|\.\.\.|--|[^\w\s]")
+
+# Single-token dosages such as "5mg", and any token that looks medical
+DOSAGE_TOKEN_RE = re.compile(r'^\d+(\.\d+)?(mg|ml|mcg|g|kg|units?)$')
+MEDICAL_TOKEN_RE = re.compile(
+    r'^(?:\d+(?:\.\d+)?(?:mg|ml|mcg|g|kg|units?)'  # Dosages
+    r'|\w+itis'                                    # Inflammatory conditions
+    r'|\w+ectomy'                                  # Surgical procedures
+    r'|\w+oscopy)$'                                # Diagnostic procedures
+)
+
+# Dosage mentions in a token sequence: an amount with its unit attached ("500mg")
+# or in the following token ("500", "mg")
+DOSAGE_AMOUNT_RE = re.compile(r'(\d+(?:\.\d+)?)(mg|ml|mcg|g|kg|units?|tablets?|capsules?)?')
+DOSAGE_UNIT_RE = re.compile(r'mg|ml|mcg|g|kg|units?|tablets?|capsules?')
+
+# Common symptom-diagnosis pairs for the coherence check
+COHERENT_PAIRS = {
+    'chest pain': ['myocardial infarction', 'angina', 'heart attack'],
+    'shortness of breath': ['asthma', 'copd', 'pneumonia', 'heart failure'],
+    'headache': ['migraine', 'tension headache', 'hypertension'],
+    'fever': ['infection', 'pneumonia', 'flu', 'sepsis']
+}
+
+# BLEU n-gram weights that emphasize unigrams and bigrams
+MEDICAL_BLEU_WEIGHTS = (0.4, 0.3, 0.2, 0.1)
+
+# Words that carry little meaning in a transcript
+FUNCTION_WORDS = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by'}
+
+# Temporal references compared by the coherence check
+TEMPORAL_PATTERNS = [
+    re.compile(r'\b(yesterday|today|tomorrow)\b'),
+    re.compile(r'\b\d+\s+(days?|weeks?|months?|years?)\b'),
+    re.compile(r'\b(morning|afternoon|evening|night)\b'),
+    re.compile(r'\b\d{1,2}:\d{2}\b')  # Time patterns
+]
+
+def normalize_medical_token(token: str) -> str:
+    """Normalize medical tokens for consistent evaluation"""
+    # Handle unit variations
+    if token in UNIT_MAPPINGS:
+        return UNIT_MAPPINGS[token]
+
+    # Handle common medical term variations
+    return MEDICAL_MAPPINGS.get(token, token)
+
+def sentence_bleu(reference: List[str], hypothesis: List[str], weights: Tuple[float, ...],
+                  epsilon: float = 0.1) -> float:
+    """Single-reference BLEU, equal to NLTK's sentence_bleu with SmoothingFunction().method1
+
+    Counts n-grams with Counters directly instead of going through NLTK's per-order
+    Fraction bookkeeping.
+    """
+    hyp_len, ref_len = len(hypothesis), len(reference)
+
+    log_precision = 0.0
+    for n, weight in enumerate(weights, start=1):
+        hyp_ngrams = Counter(zip(*(hypothesis[i:] for i in range(n))))
+        ref_ngrams = Counter(zip(*(reference[i:] for i in range(n))))
+
+        # Clipped matches over hypothesis n-grams, at least 1 to avoid dividing by zero
+        matches = sum((hyp_ngrams & ref_ngrams).values())
+        total = max(1, hyp_len - n + 1)
+
+        # Without a single matching unigram there are no higher-order matches either
+        if matches == 0 and n == 1:
+            return 0.0
+        log_precision += weight * math.log((matches or epsilon) / total)
+
+    # Brevity penalty
+    if hyp_len > ref_len:
+        brevity = 1.0
+    elif hyp_len == 0:
+        return 0.0
+    else:
+        brevity = math.exp(1 - ref_len / hyp_len)
+
+    return brevity * math.exp(log_precision)
+
+def report_json_default(obj):
+    """Convert numpy values and metric dataclasses for json; anything else is an error"""
+    if isinstance(obj, (np.generic, np.ndarray)):
+        return obj.tolist()
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def encode_token_ids(reference: List[str], hypothesis: List[str]) -> Tuple[List[int], List[int]]:
+    """Map both token sequences onto shared small integer ids"""
+    token_ids = {}
+    return ([token_ids.setdefault(token, len(token_ids)) for token in reference],
+            [token_ids.setdefault(token, len(token_ids)) for token in hypothesis])
+
+# Tokens repeat constantly and are small; whole transcripts repeat less and are large
+TOKEN_CACHE_SIZE = 65536
+TRANSCRIPT_CACHE_SIZE = 1024
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def is_dosage_token(token: str) -> bool:
+    """Whether a lowercased token is a single-token dosage such as 5mg"""
+    return DOSAGE_TOKEN_RE.match(token) is not None
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def matches_medical_pattern(token: str) -> bool:
+    """Whether a lowercased token looks medical (dosages, -itis, -ectomy, -oscopy)"""
+    return MEDICAL_TOKEN_RE.match(token) is not None
+
+@lru_cache(maxsize=TRANSCRIPT_CACHE_SIZE)
+def tokenize_and_normalize(text: str) -> Tuple[str, ...]:
+    """Tokenize and normalize text for evaluation, cached since references are rescored"""
+    # Convert to lowercase and tokenize, normalizing medical abbreviations
+    return tuple(normalize_medical_token(token) for token in TOKEN_RE.findall(text.lower()))
+
+# Slotted dataclasses (Python 3.10+) drop the per-instance __dict__ of per-pair metrics and errors
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**DATACLASS_SLOTS)
 class TranscriptionMetrics:
     """Container for transcription evaluation metrics"""
     medical_wer: float = 0.0
@@ -62,7 +213,21 @@ class TranscriptionMetrics:
     substitution_errors: int = 0
     medical_term_errors: int = 0
 
-@dataclass
+# Per-transcription scores averaged by _aggregate_metrics
+SCORE_FIELDS = ('medical_wer', 'standard_wer', 'medical_bleu', 'medical_term_accuracy',
+                'medical_term_precision', 'medical_term_recall', 'medical_term_f1',
+                'clinical_coherence', 'dosage_accuracy', 'anatomy_accuracy',
+                'procedure_accuracy', 'overall_score')
+
+# Per-transcription error counts and the batch totals they sum into
+ERROR_COUNT_FIELDS = ('insertion_errors', 'deletion_errors', 'substitution_errors', 'medical_term_errors')
+ERROR_TOTAL_KEYS = ('total_insertions', 'total_deletions', 'total_substitutions', 'total_medical_errors')
+
+# Read one metrics object's row of scores or error counts in a single call
+SCORE_GETTER = attrgetter(*SCORE_FIELDS)
+ERROR_COUNT_GETTER = attrgetter(*ERROR_COUNT_FIELDS)
+
+@dataclass(**DATACLASS_SLOTS)
 class MedicalError:
     """Represents a specific medical transcription error"""
     error_type: str  # 'substitution', 'insertion', 'deletion', 'medical_term'
@@ -72,6 +237,28 @@ class MedicalError:
     category: str  # 'drug', 'procedure', 'anatomy', etc.
     severity: str  # 'critical', 'major', 'minor'
 
+# Batches smaller than this are evaluated in-process; worker start-up would dominate
+PARALLEL_BATCH_MIN = 1000
+
+# Per-process evaluator used by ProcessPoolExecutor workers
+_WORKER_EVALUATOR = None
+
+def _init_evaluation_worker(weights: Dict[str, float]):
+    """Build this worker's evaluator once"""
+    global _WORKER_EVALUATOR
+    _WORKER_EVALUATOR = MedicalTranscriptionEvaluator(weights)
+
+def _run_evaluation_worker(pair: Tuple[str, str]) -> Tuple[TranscriptionMetrics, List[MedicalError]]:
+    """Evaluate one (reference, hypothesis) pair with the worker's evaluator"""
+    return _WORKER_EVALUATOR._evaluate_pair(*pair)
+
+@dataclass
+class CoherenceFeatures:
+    """Everything the clinical coherence checks need from one transcript"""
+    entities: Dict
+    found_terms: Set[str]  # Vocabulary terms and symptom/diagnosis phrases in the text
+    temporals: Set[str]
+
 class MedicalTranscriptionEvaluator:
     """Comprehensive evaluator for medical transcription quality"""
 
@@ -82,7 +269,8 @@ class MedicalTranscriptionEvaluator:
         Args:
             weights_config: Dictionary containing weights for different error types
         """
-        self.medical_vocab = MedicalVocabularyEnhancer()
+        # Dataset-derived terms only feed tokenizer vocabulary, so they are not mined here
+        self.medical_vocab = MedicalVocabularyEnhancer(skip_dataset_terms=True)
 
         # Default weights for different types of errors
         self.weights = {
@@ -103,24 +291,26 @@ class MedicalTranscriptionEvaluator:
         # Critical terms that must be transcribed correctly
         self.critical_terms = self._build_critical_terms_set()
 
-        # Initialize NLTK components
-        try:
-            nltk.data.find('tokenizers/punkt')
-        except LookupError:
-            nltk.download('punkt')
+        # Token -> category and token -> weight, so classifying a token is one dict lookup;
+        # filled in reverse so a term listed under several categories keeps the first one
+        self._token_categories = {}
+        for category, terms in reversed(list(self.medical_categories.items())):
+            self._token_categories.update(dict.fromkeys(terms, category))
+        self._token_weights = self._build_token_weights()
+
+        # Vocabulary terms plus symptom and diagnosis phrases, found together in one scan
+        # of each transcript
+        self._coherence_matcher = TermMatcher(
+            set(self.medical_vocab.vocabulary_terms()) | set(COHERENT_PAIRS) |
+            {dx for diagnoses in COHERENT_PAIRS.values() for dx in diagnoses}
+        )
 
     def _build_medical_category_sets(self) -> Dict[str, Set[str]]:
         """Build sets of medical terms by category"""
-        categories = {}
-
-        for category, entities in self.medical_vocab.medical_entities.items():
-            term_set = set()
-            for entity in entities:
-                term_set.add(entity.term.lower())
-                term_set.update([syn.lower() for syn in entity.synonyms])
-            categories[category] = term_set
-
-        return categories
+        return {
+            category: {name.lower() for entity in entities for name in (entity.term, *entity.synonyms)}
+            for category, entities in self.medical_vocab.medical_entities.items()
+        }
 
     def _build_critical_terms_set(self) -> Set[str]:
         """Build set of critical medical terms that must be accurate"""
@@ -143,17 +333,40 @@ class MedicalTranscriptionEvaluator:
 
         return critical
 
+    def _build_token_weights(self) -> Dict[str, float]:
+        """Weights of known tokens, with higher-priority term lists overriding lower ones"""
+        weights = dict.fromkeys(FUNCTION_WORDS, self.weights['function_word'])
+        weights.update(dict.fromkeys(self.medical_categories.get('anatomy', set()), self.weights['anatomy']))
+        weights.update(dict.fromkeys(self.medical_categories.get('procedures', set()), self.weights['procedure']))
+        weights.update(dict.fromkeys(self.medical_categories.get('drugs', set()), self.weights['medical_term']))
+        weights.update(dict.fromkeys(self.critical_terms, self.weights['dosage']))
+        return weights
+
     def evaluate_single(self, reference: str, hypothesis: str) -> TranscriptionMetrics:
         """Evaluate a single transcription against reference"""
+        return self._evaluate_with_alignment(reference, hypothesis)[0]
+
+    def _evaluate_with_alignment(self, reference: str,
+                                 hypothesis: str) -> Tuple[TranscriptionMetrics, List[Tuple[str, str]]]:
+        """Metrics for one transcription plus the token alignment they were computed from"""
         # Tokenize and normalize
         ref_tokens = self._tokenize_and_normalize(reference)
+
+        # An exact transcript is perfect on every measure except length-dependent BLEU,
+        # and its tokens are the reference's
+        if reference == hypothesis:
+            return self._identical_metrics(ref_tokens), list(zip(ref_tokens, ref_tokens))
+
         hyp_tokens = self._tokenize_and_normalize(hypothesis)
 
+        # One alignment serves the weighted WER, the error counts and the detailed errors
+        alignment = self._align_sequences(ref_tokens, hyp_tokens)
+
         # Calculate standard WER
         standard_wer = self._calculate_wer(ref_tokens, hyp_tokens)
 
         # Calculate medical WER (weighted)
-        medical_wer = self._calculate_medical_wer(ref_tokens, hyp_tokens)
+        medical_wer = self._calculate_medical_wer(ref_tokens, hyp_tokens, alignment)
 
         # Calculate BLEU score with medical focus
         medical_bleu = self._calculate_medical_bleu(ref_tokens, hyp_tokens)
@@ -176,9 +389,9 @@ class MedicalTranscriptionEvaluator:
         )
 
         # Detailed error analysis
-        errors = self._analyze_errors(ref_tokens, hyp_tokens)
+        errors = self._analyze_errors(ref_tokens, hyp_tokens, alignment)
 
-        return TranscriptionMetrics(
+        metrics = TranscriptionMetrics(
             medical_wer=medical_wer,
             standard_wer=standard_wer,
             medical_bleu=medical_bleu,
@@ -197,24 +410,69 @@ class MedicalTranscriptionEvaluator:
             medical_term_errors=errors['medical_errors']
         )
 
-    def evaluate_batch(self, references: List[str], hypotheses: List[str]) -> Dict:
-        """Evaluate a batch of transcriptions"""
-        if len(references) != len(hypotheses):
-            raise ValueError("References and hypotheses must have same length")
+        return metrics, alignment
 
-        all_metrics = []
-        detailed_errors = []
+    def _identical_metrics(self, tokens: List[str]) -> TranscriptionMetrics:
+        """Metrics of a transcription that matches its reference exactly"""
+        medical_bleu = self._calculate_medical_bleu(tokens, tokens)
 
-        for ref, hyp in zip(references, hypotheses):
-            metrics = self.evaluate_single(ref, hyp)
-            all_metrics.append(metrics)
+        return TranscriptionMetrics(
+            medical_wer=0.0,
+            standard_wer=0.0,
+            medical_bleu=medical_bleu,
+            medical_term_accuracy=1.0,
+            medical_term_precision=1.0,
+            medical_term_recall=1.0,
+            medical_term_f1=1.0,
+            clinical_coherence=1.0,
+            dosage_accuracy=1.0,
+            anatomy_accuracy=float('anatomy' in self.medical_categories),
+            procedure_accuracy=float('procedures' in self.medical_categories),
+            overall_score=self._calculate_overall_score(0.0, medical_bleu, 1.0, 1.0, 1.0)
+        )
 
-            # Collect detailed errors for analysis
-            errors = self._get_detailed_errors(ref, hyp)
-            detailed_errors.extend(errors)
+    def evaluate_batch(self, references: List[str], hypotheses: List[str],
+                       num_workers: Optional[int] = None) -> Dict:
+        """Evaluate a batch of transcriptions, across worker processes for large batches"""
+        if len(references) != len(hypotheses):
+            raise ValueError("References and hypotheses must have same length")
+
+        # Repeated (reference, hypothesis) pairs are evaluated once; sample_rows maps each
+        # sample to its distinct pair
+        pair_rows = {}
+        sample_rows = [pair_rows.setdefault(pair, len(pair_rows)) for pair in zip(references, hypotheses)]
+        pairs = list(pair_rows)
+
+        # Scores and error counts are written straight into their aggregation matrices
+        scores = np.empty((len(pairs), len(SCORE_FIELDS)), dtype=np.float64)
+        error_counts = np.empty((len(pairs), len(ERROR_COUNT_FIELDS)), dtype=np.int64)
+        pair_errors = []
+
+        workers = min(num_workers or os.cpu_count() or 1, len(pairs))
+        if workers > 1 and len(pairs) >= PARALLEL_BATCH_MIN:
+            # Pairs are independent; each worker builds its own evaluator with our weights
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_evaluation_worker,
+                                     initargs=(self.weights,)) as executor:
+                results = list(executor.map(_run_evaluation_worker, pairs,
+                                            chunksize=max(1, len(pairs) // (4 * workers))))
+        else:
+            results = (self._evaluate_pair(reference, hypothesis) for reference, hypothesis in pairs)
+
+        for row, (metrics, errors) in enumerate(results):
+            scores[row] = SCORE_GETTER(metrics)
+            error_counts[row] = ERROR_COUNT_GETTER(metrics)
+            pair_errors.append(errors)
+
+        # Expand back to one row per sample so repeats weigh in as often as they occur
+        if len(pairs) < len(sample_rows):
+            scores = scores[sample_rows]
+            error_counts = error_counts[sample_rows]
+
+        # Collect detailed errors for analysis
+        detailed_errors = [error for row in sample_rows for error in pair_errors[row]]
 
         # Aggregate metrics
-        aggregated = self._aggregate_metrics(all_metrics)
+        aggregated = self._aggregate_metric_arrays(scores, error_counts)
 
         # Add error analysis
         aggregated['error_analysis'] = self._analyze_error_patterns(detailed_errors)
@@ -222,66 +480,47 @@ class MedicalTranscriptionEvaluator:
 
         return aggregated
 
+    def _evaluate_pair(self, reference: str, hypothesis: str) -> Tuple[TranscriptionMetrics, List[MedicalError]]:
+        """Metrics and detailed errors for one transcription"""
+        metrics, alignment = self._evaluate_with_alignment(reference, hypothesis)
+        return metrics, self._detailed_errors_from_alignment(alignment)
+
     def _tokenize_and_normalize(self, text: str) -> List[str]:
         """Tokenize and normalize text for evaluation"""
-        # Convert to lowercase and tokenize
-        tokens = word_tokenize(text.lower())
-
-        # Normalize medical abbreviations
-        normalized_tokens = []
-        for token in tokens:
-            # Handle common medical abbreviations
-            normalized_token = self._normalize_medical_token(token)
-            normalized_tokens.append(normalized_token)
-
-        return normalized_tokens
+        return list(tokenize_and_normalize(text))
 
     def _normalize_medical_token(self, token: str) -> str:
         """Normalize medical tokens for consistent evaluation"""
-        # Handle unit variations
-        unit_mappings = {
-            'milligrams': 'mg',
-            'milligram': 'mg',
-            'milliliters': 'ml',
-            'milliliter': 'ml',
-            'micrograms': 'mcg',
-            'microgram': 'mcg',
-            'kilograms': 'kg',
-            'kilogram': 'kg'
-        }
-
-        if token in unit_mappings:
-            return unit_mappings[token]
-
-        # Handle common medical term variations
-        medical_mappings = {
-            'heart attack': 'myocardial infarction',
-            'high blood pressure': 'hypertension',
-            'sugar diabetes': 'diabetes mellitus'
-        }
-
-        return medical_mappings.get(token, token)
+        return normalize_medical_token(token)
 
     def _calculate_wer(self, reference: List[str], hypothesis: List[str]) -> float:
         """Calculate standard Word Error Rate"""
         if not reference:
             return 1.0 if hypothesis else 0.0
 
+        if reference == hypothesis:
+            return 0.0
+
         # Calculate edit distance
-        edit_distance = distance.edit_distance(reference, hypothesis)
+        edit_distance = Levenshtein.distance(*encode_token_ids(reference, hypothesis))
 
         # WER = edit_distance / reference_length
         wer = edit_distance / len(reference)
 
         return min(wer, 1.0)  # Cap at 1.0
 
-    def _calculate_medical_wer(self, reference: List[str], hypothesis: List[str]) -> float:
+    def _calculate_medical_wer(self, reference: List[str], hypothesis: List[str],
+                               alignment: Optional[List[Tuple[str, str]]] = None) -> float:
         """Calculate weighted WER with emphasis on medical terms"""
         if not reference:
             return 1.0 if hypothesis else 0.0
 
-        # Create alignment using dynamic programming
-        alignment = self._align_sequences(reference, hypothesis)
+        if reference == hypothesis:
+            return 0.0
+
+        # Align unless the caller already has the alignment
+        if alignment is None:
+            alignment = self._align_sequences(reference, hypothesis)
 
         total_weight = 0.0
         error_weight = 0.0
@@ -304,58 +543,43 @@ class MedicalTranscriptionEvaluator:
 
         token_lower = token.lower()
 
-        # Critical terms get highest weight
-        if token_lower in self.critical_terms:
-            return self.weights['dosage']
-
-        # Check medical categories
-        if token_lower in self.medical_categories.get('drugs', set()):
-            return self.weights['medical_term']
-
-        if token_lower in self.medical_categories.get('procedures', set()):
-            return self.weights['procedure']
-
-        if token_lower in self.medical_categories.get('anatomy', set()):
-            return self.weights['anatomy']
+        # Critical terms, drugs, procedures, anatomy and function words, in that priority
+        weight = self._token_weights.get(token_lower)
+        if weight is not None:
+            return weight
 
         # Check if it's a dosage pattern
-        if re.match(r'^\d+(\.\d+)?(mg|ml|mcg|g|kg|units?)$', token_lower):
+        if is_dosage_token(token_lower):
             return self.weights['dosage']
 
-        # Function words get lower weight
-        function_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by'}
-        if token_lower in function_words:
-            return self.weights['function_word']
-
         # Default weight for standard words
         return self.weights['standard_word']
 
     def _align_sequences(self, reference: List[str], hypothesis: List[str]) -> List[Tuple[str, str]]:
         """Align sequences using dynamic programming for optimal matching"""
+        if reference == hypothesis:
+            return list(zip(reference, hypothesis))
+
+        ref_ids, hyp_ids = (np.asarray(ids, dtype=np.int32) for ids in encode_token_ids(reference, hypothesis))
         ref_len = len(reference)
         hyp_len = len(hypothesis)
 
-        # Initialize DP table
-        dp = [[0] * (hyp_len + 1) for _ in range(ref_len + 1)]
-
-        # Fill DP table
-        for i in range(ref_len + 1):
-            for j in range(hyp_len + 1):
-                if i == 0:
-                    dp[i][j] = j  # All insertions
-                elif j == 0:
-                    dp[i][j] = i  # All deletions
-                else:
-                    if reference[i-1] == hypothesis[j-1]:
-                        dp[i][j] = dp[i-1][j-1]  # Match
-                    else:
-                        dp[i][j] = 1 + min(
-                            dp[i-1][j],      # Deletion
-                            dp[i][j-1],      # Insertion
-                            dp[i-1][j-1]     # Substitution
-                        )
-
-        # Backtrack to find alignment
+        # Fill the DP table a row at a time; a running minimum resolves the insertion chain
+        columns = np.arange(hyp_len + 1, dtype=np.int32)
+        dp = np.empty((ref_len + 1, hyp_len + 1), dtype=np.int32)
+        dp[0] = columns  # All insertions
+        for i in range(1, ref_len + 1):
+            row = dp[i]
+            row[0] = i  # All deletions
+            np.minimum(dp[i - 1, :-1] + (hyp_ids != ref_ids[i - 1]),  # Match or substitution
+                       dp[i - 1, 1:] + 1,                             # Deletion
+                       out=row[1:])
+            row -= columns
+            np.minimum.accumulate(row, out=row)                       # Insertion
+            row += columns
+
+        # Backtrack to find alignment, preferring matches, then substitutions, then deletions
+        dp = dp.tolist()
         alignment = []
         i, j = ref_len, hyp_len
 
@@ -382,35 +606,14 @@ class MedicalTranscriptionEvaluator:
         if not reference or not hypothesis:
             return 0.0
 
-        # Standard BLEU calculation
-        smoothing = SmoothingFunction()
-
         # Calculate with different n-gram weights to emphasize medical phrases
-        weights = (0.4, 0.3, 0.2, 0.1)  # Emphasize unigrams and bigrams
-
-        try:
-            bleu_score = sentence_bleu(
-                [reference], hypothesis,
-                weights=weights,
-                smoothing_function=smoothing.method1
-            )
-            return bleu_score
-        except:
-            return 0.0
+        return sentence_bleu(reference, hypothesis, MEDICAL_BLEU_WEIGHTS)
 
     def _calculate_medical_term_accuracy(self, reference: List[str], hypothesis: List[str]) -> Dict[str, float]:
         """Calculate precision, recall, and F1 for medical terms"""
-        # Extract medical terms from both sequences
-        ref_medical = set()
-        hyp_medical = set()
-
-        for token in reference:
-            if self._is_medical_term(token):
-                ref_medical.add(token.lower())
-
-        for token in hypothesis:
-            if self._is_medical_term(token):
-                hyp_medical.add(token.lower())
+        # Extract medical terms from both sequences; each distinct token is classified once
+        ref_medical = {token.lower() for token in set(reference) if self._is_medical_term(token)}
+        hyp_medical = {token.lower() for token in set(hypothesis) if self._is_medical_term(token)}
 
         # Calculate metrics
         if not ref_medical and not hyp_medical:
@@ -441,29 +644,18 @@ class MedicalTranscriptionEvaluator:
         token_lower = token.lower()
 
         # Check all medical categories
-        for category_set in self.medical_categories.values():
-            if token_lower in category_set:
-                return True
-
-        # Check if it matches medical patterns
-        medical_patterns = [
-            r'^\d+(\.\d+)?(mg|ml|mcg|g|kg|units?)$',  # Dosages
-            r'^\w+itis$',  # Inflammatory conditions
-            r'^\w+ectomy$',  # Surgical procedures
-            r'^\w+oscopy$',  # Diagnostic procedures
-        ]
-
-        for pattern in medical_patterns:
-            if re.match(pattern, token_lower):
-                return True
+        if token_lower in self._token_categories:
+            return True
 
-        return False
+        # Check if it matches medical patterns (dosages, -itis, -ectomy, -oscopy)
+        return matches_medical_pattern(token_lower)
 
     def _calculate_clinical_coherence(self, reference: str, hypothesis: str) -> float:
         """Evaluate clinical coherence and logical flow"""
-        # Extract medical context from both texts
-        ref_entities = self.medical_vocab.extract_medical_entities(reference)
-        hyp_entities = self.medical_vocab.extract_medical_entities(hypothesis)
+        # Extract medical context from both texts, one pass each
+        ref_features = self._extract_coherence_features(reference)
+        hyp_features = self._extract_coherence_features(hypothesis)
+        ref_entities, hyp_entities = ref_features.entities, hyp_features.entities
 
         coherence_score = 0.0
         total_checks = 0
@@ -473,11 +665,11 @@ class MedicalTranscriptionEvaluator:
         total_checks += 1
 
         # Check symptom-diagnosis coherence
-        coherence_score += self._check_symptom_diagnosis_coherence(reference, hypothesis)
+        coherence_score += self._check_symptom_diagnosis_coherence(ref_features, hyp_features)
         total_checks += 1
 
         # Check temporal consistency
-        coherence_score += self._check_temporal_consistency(reference, hypothesis)
+        coherence_score += self._check_temporal_consistency(ref_features, hyp_features)
         total_checks += 1
 
         # Check anatomical consistency
@@ -486,6 +678,21 @@ class MedicalTranscriptionEvaluator:
 
         return coherence_score / total_checks if total_checks > 0 else 0.0
 
+    def _extract_coherence_features(self, text: str) -> CoherenceFeatures:
+        """Lowercase and scan a transcript once for all coherence checks"""
+        text_lower = text.lower()
+        found_terms = self._coherence_matcher.find(text_lower)
+
+        temporals = set()
+        for pattern in TEMPORAL_PATTERNS:
+            temporals.update(pattern.findall(text_lower))
+
+        return CoherenceFeatures(
+            entities=self.medical_vocab.extract_medical_entities(text, found_terms=found_terms),
+            found_terms=found_terms,
+            temporals=temporals
+        )
+
     def _check_medication_dosage_coherence(self, ref_entities: Dict, hyp_entities: Dict) -> float:
         """Check if medications are mentioned with appropriate dosages"""
         ref_meds = set(ref_entities.get('medications', []))
@@ -510,48 +717,31 @@ class MedicalTranscriptionEvaluator:
 
         return score
 
-    def _check_symptom_diagnosis_coherence(self, reference: str, hypothesis: str) -> float:
+    def _check_symptom_diagnosis_coherence(self, ref_features: CoherenceFeatures,
+                                           hyp_features: CoherenceFeatures) -> float:
         """Check logical consistency between symptoms and diagnoses"""
-        # Simple pattern matching for common symptom-diagnosis pairs
-        coherent_pairs = {
-            'chest pain': ['myocardial infarction', 'angina', 'heart attack'],
-            'shortness of breath': ['asthma', 'copd', 'pneumonia', 'heart failure'],
-            'headache': ['migraine', 'tension headache', 'hypertension'],
-            'fever': ['infection', 'pneumonia', 'flu', 'sepsis']
-        }
-
-        ref_lower = reference.lower()
-        hyp_lower = hypothesis.lower()
+        ref_found = ref_features.found_terms
+        hyp_found = hyp_features.found_terms
 
         coherence_count = 0
         total_symptoms = 0
 
-        for symptom, diagnoses in coherent_pairs.items():
-            if symptom in ref_lower:
+        for symptom, diagnoses in COHERENT_PAIRS.items():
+            if symptom in ref_found:
                 total_symptoms += 1
-                ref_has_diagnosis = any(dx in ref_lower for dx in diagnoses)
-                hyp_has_diagnosis = any(dx in hyp_lower for dx in diagnoses)
+                ref_has_diagnosis = not ref_found.isdisjoint(diagnoses)
+                hyp_has_diagnosis = not hyp_found.isdisjoint(diagnoses)
 
                 if ref_has_diagnosis == hyp_has_diagnosis:
                     coherence_count += 1
 
         return coherence_count / total_symptoms if total_symptoms > 0 else 1.0
 
-    def _check_temporal_consistency(self, reference: str, hypothesis: str) -> float:
+    def _check_temporal_consistency(self, ref_features: CoherenceFeatures,
+                                    hyp_features: CoherenceFeatures) -> float:
         """Check consistency of temporal references"""
-        temporal_patterns = [
-            r'\b(yesterday|today|tomorrow)\b',
-            r'\b\d+\s+(days?|weeks?|months?|years?)\b',
-            r'\b(morning|afternoon|evening|night)\b',
-            r'\b\d{1,2}:\d{2}\b'  # Time patterns
-        ]
-
-        ref_temporals = set()
-        hyp_temporals = set()
-
-        for pattern in temporal_patterns:
-            ref_temporals.update(re.findall(pattern, reference.lower()))
-            hyp_temporals.update(re.findall(pattern, hypothesis.lower()))
+        ref_temporals = ref_features.temporals
+        hyp_temporals = hyp_features.temporals
 
         if not ref_temporals and not hyp_temporals:
             return 1.0
@@ -582,10 +772,8 @@ class MedicalTranscriptionEvaluator:
 
     def _calculate_dosage_accuracy(self, reference: List[str], hypothesis: List[str]) -> float:
         """Calculate accuracy specifically for dosage information"""
-        dosage_pattern = r'\b\d+(\.\d+)?\s*(mg|ml|mcg|g|kg|units?|tablets?|capsules?)\b'
-
-        ref_dosages = set(re.findall(dosage_pattern, ' '.join(reference), re.IGNORECASE))
-        hyp_dosages = set(re.findall(dosage_pattern, ' '.join(hypothesis), re.IGNORECASE))
+        ref_dosages = self._extract_dosages(reference)
+        hyp_dosages = self._extract_dosages(hypothesis)
 
         if not ref_dosages and not hyp_dosages:
             return 1.0
@@ -593,15 +781,28 @@ class MedicalTranscriptionEvaluator:
         if not ref_dosages or not hyp_dosages:
             return 0.0
 
-        # Convert tuples to strings for comparison
-        ref_dosage_strs = set(''.join(dosage) for dosage in ref_dosages)
-        hyp_dosage_strs = set(''.join(dosage) for dosage in hyp_dosages)
-
-        intersection = ref_dosage_strs.intersection(hyp_dosage_strs)
-        union = ref_dosage_strs.union(hyp_dosage_strs)
+        intersection = ref_dosages.intersection(hyp_dosages)
+        union = ref_dosages.union(hyp_dosages)
 
         return len(intersection) / len(union) if union else 0.0
 
+    def _extract_dosages(self, tokens: List[str]) -> Set[str]:
+        """Amount-plus-unit dosages ("500mg") found in a lowercased token sequence"""
+        dosages = set()
+
+        for i, token in enumerate(tokens):
+            match = DOSAGE_AMOUNT_RE.fullmatch(token)
+            if not match:
+                continue
+
+            amount, unit = match.groups()
+            if unit is None and i + 1 < len(tokens) and DOSAGE_UNIT_RE.fullmatch(tokens[i + 1]):
+                unit = tokens[i + 1]
+            if unit is not None:
+                dosages.add(amount + unit)
+
+        return dosages
+
     def _calculate_category_accuracy(self, reference: List[str], hypothesis: List[str], category: str) -> float:
         """Calculate accuracy for a specific medical category"""
         if category not in self.medical_categories:
@@ -649,9 +850,11 @@ class MedicalTranscriptionEvaluator:
 
         return overall
 
-    def _analyze_errors(self, reference: List[str], hypothesis: List[str]) -> Dict[str, int]:
+    def _analyze_errors(self, reference: List[str], hypothesis: List[str],
+                        alignment: Optional[List[Tuple[str, str]]] = None) -> Dict[str, int]:
         """Analyze error types in detail"""
-        alignment = self._align_sequences(reference, hypothesis)
+        if alignment is None:
+            alignment = self._align_sequences(reference, hypothesis)
 
         errors = {
             'insertions': 0,
@@ -680,8 +883,10 @@ class MedicalTranscriptionEvaluator:
         """Get detailed error analysis for pattern recognition"""
         ref_tokens = self._tokenize_and_normalize(reference)
         hyp_tokens = self._tokenize_and_normalize(hypothesis)
-        alignment = self._align_sequences(ref_tokens, hyp_tokens)
+        return self._detailed_errors_from_alignment(self._align_sequences(ref_tokens, hyp_tokens))
 
+    def _detailed_errors_from_alignment(self, alignment: List[Tuple[str, str]]) -> List[MedicalError]:
+        """Classify every mismatched pair of an existing alignment"""
         detailed_errors = []
 
         for i, (ref_token, hyp_token) in enumerate(alignment):
@@ -715,11 +920,11 @@ class MedicalTranscriptionEvaluator:
 
         token_lower = token.lower()
 
-        for category, terms in self.medical_categories.items():
-            if token_lower in terms:
-                return category
+        category = self._token_categories.get(token_lower)
+        if category is not None:
+            return category
 
-        if re.match(r'^\d+(\.\d+)?(mg|ml|mcg|g|kg|units?)$', token_lower):
+        if is_dosage_token(token_lower):
             return 'dosage'
 
         return 'general'
@@ -742,32 +947,21 @@ class MedicalTranscriptionEvaluator:
         if not metrics_list:
             return {}
 
-        # Calculate means
-        aggregated = {
-            'medical_wer': np.mean([m.medical_wer for m in metrics_list]),
-            'standard_wer': np.mean([m.standard_wer for m in metrics_list]),
-            'medical_bleu': np.mean([m.medical_bleu for m in metrics_list]),
-            'medical_term_accuracy': np.mean([m.medical_term_accuracy for m in metrics_list]),
-            'medical_term_precision': np.mean([m.medical_term_precision for m in metrics_list]),
-            'medical_term_recall': np.mean([m.medical_term_recall for m in metrics_list]),
-            'medical_term_f1': np.mean([m.medical_term_f1 for m in metrics_list]),
-            'clinical_coherence': np.mean([m.clinical_coherence for m in metrics_list]),
-            'dosage_accuracy': np.mean([m.dosage_accuracy for m in metrics_list]),
-            'anatomy_accuracy': np.mean([m.anatomy_accuracy for m in metrics_list]),
-            'procedure_accuracy': np.mean([m.procedure_accuracy for m in metrics_list]),
-            'overall_score': np.mean([m.overall_score for m in metrics_list]),
-        }
+        # One pass over the metrics objects, then a mean and std per column
+        scores = np.array([SCORE_GETTER(m) for m in metrics_list], dtype=np.float64)
+        error_counts = np.array([ERROR_COUNT_GETTER(m) for m in metrics_list], dtype=np.int64)
+        return self._aggregate_metric_arrays(scores, error_counts)
+
+    def _aggregate_metric_arrays(self, scores: np.ndarray, error_counts: np.ndarray) -> Dict:
+        """Aggregate per-transcription score and error-count rows"""
+        if not len(scores):
+            return {}
 
-        # Calculate standard deviations
-        for key in aggregated.keys():
-            values = [getattr(m, key) for m in metrics_list]
-            aggregated[f'{key}_std'] = np.std(values)
+        aggregated = dict(zip(SCORE_FIELDS, scores.mean(axis=0).tolist()))
+        aggregated.update(zip((f'{field}_std' for field in SCORE_FIELDS), scores.std(axis=0).tolist()))
 
         # Error totals
-        aggregated['total_insertions'] = sum(m.insertion_errors for m in metrics_list)
-        aggregated['total_deletions'] = sum(m.deletion_errors for m in metrics_list)
-        aggregated['total_substitutions'] = sum(m.substitution_errors for m in metrics_list)
-        aggregated['total_medical_errors'] = sum(m.medical_term_errors for m in metrics_list)
+        aggregated.update(zip(ERROR_TOTAL_KEYS, error_counts.sum(axis=0).tolist()))
 
         return aggregated
 
@@ -776,29 +970,32 @@ class MedicalTranscriptionEvaluator:
         if not errors:
             return {}
 
-        analysis = {
-            'error_distribution': Counter(error.error_type for error in errors),
-            'category_errors': Counter(error.category for error in errors),
-            'severity_distribution': Counter(error.severity for error in errors),
-            'common_substitutions': defaultdict(list),
-            'problematic_categories': []
-        }
+        # Tally types, categories, severities and substitutions in one pass
+        error_types = Counter()
+        category_counts = Counter()
+        severities = Counter()
+        substitutions = defaultdict(list)
 
-        # Analyze substitution patterns
         for error in errors:
+            error_types[error.error_type] += 1
+            category_counts[error.category] += 1
+            severities[error.severity] += 1
             if error.error_type == 'substitution':
-                analysis['common_substitutions'][error.reference_word].append(error.hypothesis_word)
+                substitutions[error.reference_word].append(error.hypothesis_word)
 
-        # Find problematic categories
-        category_error_rates = {}
-        for category in self.medical_categories.keys():
-            category_errors = [e for e in errors if e.category == category]
-            if category_errors:
-                category_error_rates[category] = len(category_errors)
+        analysis = {
+            'error_distribution': error_types,
+            'category_errors': category_counts,
+            'severity_distribution': severities,
+            'common_substitutions': substitutions,
+            'problematic_categories': []
+        }
 
-        # Sort by error count
-        sorted_categories = sorted(category_error_rates.items(), key=lambda x: x[1], reverse=True)
-        analysis['problematic_categories'] = sorted_categories[:5]
+        # The five medical categories with the most errors
+        medical_category_counts = Counter({category: category_counts[category]
+                                           for category in self.medical_categories
+                                           if category_counts[category]})
+        analysis['problematic_categories'] = medical_category_counts.most_common(5)
 
         return analysis
 
@@ -814,8 +1011,15 @@ class MedicalTranscriptionEvaluator:
             }
         }
 
-        with open(filepath, 'w') as f:
-            json.dump(report, f, indent=2, default=str)
+        if ORJSON_AVAILABLE:
+            option = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            # orjson serializes numpy values and dataclasses natively
+            payload = orjson.dumps(report, option=option)
+        else:
+            payload = json.dumps(report, indent=2, default=report_json_default).encode('utf-8')
+
+        with open(filepath, 'wb') as f:
+            f.write(payload)
 
         logger.info(f"Evaluation report saved to {filepath}")
 
@@ -27,10 +27,14 @@ Usage:
 
 import os
 import json
+import zlib
+import shutil
+import hashlib
 import torch
 import logging
 import argparse
 import numpy as np
+import pandas as pd
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Tuple, Optional
@@ -47,8 +51,7 @@ from transformers import (
     TrainingArguments,
     EarlyStoppingCallback
 )
-from datasets import Dataset, DatasetDict, Audio
-from sklearn.model_selection import train_test_split
+from datasets import Dataset, DatasetDict, Audio, load_from_disk
 import evaluate
 
 # Import our medical vocabulary and evaluation modules
@@ -79,11 +82,16 @@ class TrainingConfig:
     gradient_accumulation_steps: int = 2
     learning_rate: float = 1e-5
     warmup_steps: int = 500
+    gradient_checkpointing: Optional[bool] = None  # None: only for large models or batches
+    torch_compile: bool = True  # TorchInductor kernel fusion, on GPU only
+    freeze_encoder: bool = True  # Train only the decoder on small medical corpora
 
     # Data parameters
     max_audio_length: int = 30  # seconds
     sampling_rate: int = 16000
     language: str = "en"
+    preprocessing_batch_size: int = 32
+    preprocessing_num_workers: int = max(1, (os.cpu_count() or 1) // 2)
 
     # Medical vocabulary enhancement
     enhance_vocabulary: bool = True
@@ -98,6 +106,10 @@ class TrainingConfig:
     save_steps: int = 1000
     metric_for_best_model: str = "medical_wer"  # Medical Word Error Rate
 
+# Settings that change the prepared features or labels; cached features from other values are not reused
+PREPARED_CACHE_FIELDS = ("model_name", "language", "enhance_vocabulary", "medical_vocab_size",
+                         "sampling_rate", "max_audio_length")
+
 class MedicalDataProcessor:
     """Processes medical audio/text data for Whisper fine-tuning"""
 
@@ -106,6 +118,12 @@ class MedicalDataProcessor:
         self.feature_extractor = WhisperFeatureExtractor.from_pretrained(config.model_name)
         self.tokenizer = WhisperTokenizer.from_pretrained(config.model_name, language=config.language)
         self.medical_vocab = MedicalVocabularyEnhancer()
+        self._rng = np.random.default_rng()
+
+        # Audio files already on disk, listed once so re-runs skip them without a stat each
+        self._synth_audio_dir = Path(config.output_dir) / "synthetic_audio"
+        self._synth_audio_dir.mkdir(parents=True, exist_ok=True)
+        self._existing_audio = {entry.name for entry in os.scandir(self._synth_audio_dir)}
 
         # Add medical vocabulary to tokenizer
         if config.enhance_vocabulary:
@@ -115,12 +133,12 @@ class MedicalDataProcessor:
         """Add medical terms to the tokenizer vocabulary"""
         logger.info("Enhancing tokenizer with medical vocabulary...")
 
-        medical_terms = self.medical_vocab.get_medical_terms()
-        new_tokens = []
+        # Ask for only as many terms as will be considered, rather than slicing a longer list
+        medical_terms = self.medical_vocab.get_medical_terms(max_terms=self.config.medical_vocab_size)
 
-        for term in medical_terms[:self.config.medical_vocab_size]:
-            if term not in self.tokenizer.get_vocab():
-                new_tokens.append(term)
+        # get_vocab() rebuilds the whole vocabulary dict, so take it once
+        vocab = set(self.tokenizer.get_vocab())
+        new_tokens = [term for term in medical_terms if term not in vocab]
 
         if new_tokens:
             self.tokenizer.add_tokens(new_tokens)
@@ -131,6 +149,24 @@ class MedicalDataProcessor:
         os.makedirs(enhanced_tokenizer_path, exist_ok=True)
         self.tokenizer.save_pretrained(enhanced_tokenizer_path)
 
+    def prepared_cache_path(self) -> Path:
+        """Directory for prepared features, keyed on the settings and input files they came from"""
+        # Labels depend on the tokenizer and its added vocabulary, features on the audio settings
+        settings = {field: getattr(self.config, field) for field in PREPARED_CACHE_FIELDS}
+
+        # Any added, removed or modified file under data_dir changes the key
+        data_dir = Path(self.config.data_dir)
+        inputs = []
+        if data_dir.is_dir():
+            for path in sorted(data_dir.rglob("*")):
+                if path.is_file():
+                    stat = path.stat()
+                    inputs.append([str(path.relative_to(data_dir)), stat.st_mtime_ns, stat.st_size])
+
+        key = json.dumps({"settings": settings, "inputs": inputs}, sort_keys=True).encode('utf-8')
+        digest = hashlib.blake2b(key, digest_size=8).hexdigest()
+        return Path(self.config.output_dir) / "prepared_cache" / digest
+
     def load_medical_datasets(self) -> DatasetDict:
         """Load and process medical audio datasets"""
         logger.info(f"Loading medical datasets from {self.config.data_dir}")
@@ -144,9 +180,12 @@ class MedicalDataProcessor:
         # Combine datasets
         all_data = mts_data + synthetic_data
 
-        # Split into train/validation/test
-        train_data, temp_data = train_test_split(all_data, test_size=0.3, random_state=42)
-        val_data, test_data = train_test_split(temp_data, test_size=0.5, random_state=42)
+        # Split 70/15/15 into train/validation/test in one pass; a stable hash of the
+        # audio path keeps every file in the same split across runs
+        train_data, val_data, test_data = [], [], []
+        for item in all_data:
+            bucket = (zlib.crc32(item["audio"].encode()) & 0xFFFF) / 65536.0
+            (train_data if bucket < 0.7 else val_data if bucket < 0.85 else test_data).append(item)
 
         # Create Dataset objects
         train_dataset = Dataset.from_list(train_data)
@@ -182,26 +221,29 @@ class MedicalDataProcessor:
             logger.info(f"Processing {csv_file}")
 
             # Read CSV and extract conversations
-            import pandas as pd
             df = pd.read_csv(csv_file)
 
+            column = 'conversation' if 'conversation' in df.columns else 'text' if 'text' in df.columns else None
+            if column is None:
+                continue
+
+            # Strip and filter the whole column at once, keeping the row labels for file names
+            texts = df[column].dropna().astype(str).str.strip()
+            texts = texts[texts.str.len() > 10]
+
             # Convert text to speech using text-to-speech
             # For now, we'll simulate this process
-            for idx, row in df.iterrows():
-                if 'conversation' in df.columns or 'text' in df.columns:
-                    text = row.get('conversation', row.get('text', ''))
-
-                    if text and len(text.strip()) > 10:
-                        # Generate synthetic audio path
-                        audio_path = self._generate_synthetic_audio(text, f"mts_{csv_file.stem}_{idx}")
-
-                        if audio_path:
-                            data.append({
-                                "audio": audio_path,
-                                "text": text.strip(),
-                                "source": "mts_dialog",
-                                "medical_context": self._extract_medical_context(text)
-                            })
+            for idx, text in texts.items():
+                # Generate synthetic audio path
+                audio_path = self._generate_synthetic_audio(text, f"mts_{csv_file.stem}_{idx}")
+
+                if audio_path:
+                    data.append({
+                        "audio": audio_path,
+                        "text": text,
+                        "source": "mts_dialog",
+                        "medical_context": self._extract_medical_context(text)
+                    })
 
         return data
 
@@ -223,20 +265,30 @@ class MedicalDataProcessor:
             }
         ]
 
+        # Draw every template and option index up front, one RNG call per option list
+        num_examples = 100
+        template_idx = self._rng.integers(len(templates), size=num_examples)
+        option_idx = [
+            {key: self._rng.integers(len(options), size=num_examples)
+             for key, options in template.items() if isinstance(options, list)}
+            for template in templates
+        ]
+
         # Generate synthetic examples
-        for i in range(100):  # Generate 100 synthetic examples
-            template = np.random.choice(templates)
+        for i in range(num_examples):
+            template = templates[template_idx[i]]
+            picks = option_idx[template_idx[i]]
 
             if "symptom" in template["template"]:
                 text = template["template"].format(
-                    symptom=np.random.choice(template["medical_terms"]),
-                    duration=np.random.choice(template["durations"]),
+                    symptom=template["medical_terms"][picks["medical_terms"][i]],
+                    duration=template["durations"][picks["durations"][i]],
                     additional_info="Patient reports no allergies."
                 )
             else:
                 text = template["template"].format(
-                    finding=np.random.choice(template["findings"]),
-                    vital_signs=np.random.choice(template["vital_signs"])
+                    finding=template["findings"][picks["findings"][i]],
+                    vital_signs=template["vital_signs"][picks["vital_signs"][i]]
                 )
 
             audio_path = self._generate_synthetic_audio(text, f"synthetic_{i}")
@@ -254,14 +306,11 @@ class MedicalDataProcessor:
     def _generate_synthetic_audio(self, text: str, identifier: str) -> Optional[str]:
         """Generate synthetic audio from text using TTS"""
         try:
-            # Create audio directory
-            audio_dir = Path(self.config.output_dir) / "synthetic_audio"
-            audio_dir.mkdir(parents=True, exist_ok=True)
-
-            audio_path = audio_dir / f"{identifier}.wav"
+            audio_name = f"{identifier}.wav"
+            audio_path = self._synth_audio_dir / audio_name
 
             # Skip if already exists
-            if audio_path.exists():
+            if audio_name in self._existing_audio:
                 return str(audio_path)
 
             # For this implementation, we'll create a placeholder
@@ -273,14 +322,15 @@ class MedicalDataProcessor:
 
             # Create a simple synthetic audio file (silence for now)
             duration = min(len(text) * 0.1, self.config.max_audio_length)  # Rough estimate
-            silence = np.zeros(int(duration * self.config.sampling_rate), dtype=np.float32)
+            num_samples = int(duration * self.config.sampling_rate)
 
-            # Add some noise to make it more realistic
-            noise = np.random.normal(0, 0.01, silence.shape)
-            audio = silence + noise
+            # Low-level float32 noise stands in for speech; silence plus noise is just the noise
+            audio = self._rng.standard_normal(num_samples, dtype=np.float32)
+            audio *= np.float32(0.01 * 32767)
 
-            # Save audio
-            sf.write(audio_path, audio, self.config.sampling_rate)
+            # Save audio as 16-bit PCM samples, the WAV subtype it is stored in anyway
+            sf.write(audio_path, audio.astype(np.int16), self.config.sampling_rate, subtype='PCM_16')
+            self._existing_audio.add(audio_name)
 
             logger.debug(f"Generated synthetic audio: {audio_path}")
             return str(audio_path)
@@ -295,33 +345,37 @@ class MedicalDataProcessor:
 
     def prepare_dataset(self, dataset: Dataset) -> Dataset:
         """Prepare dataset for training"""
-        def prepare_example(example):
-            # Load and process audio
-            audio = example["audio"]
+        def prepare_batch(batch):
+            # Load and process audio; the audio column is cast to one sampling rate
+            audio = batch["audio"]
 
-            # Extract features
+            # Extract features for the whole batch in one call
             inputs = self.feature_extractor(
-                audio["array"],
-                sampling_rate=audio["sampling_rate"],
-                return_tensors="pt"
+                [example["array"] for example in audio],
+                sampling_rate=self.config.sampling_rate,
+                return_tensors="np"
             )
 
-            # Tokenize text
+            # Tokenize text, leaving each label sequence at its own length
             with self.tokenizer.as_target_tokenizer():
                 labels = self.tokenizer(
-                    example["text"],
-                    return_tensors="pt",
-                    padding=True,
+                    batch["text"],
                     truncation=True,
                     max_length=448  # Whisper's max sequence length
                 ).input_ids
 
-            example["input_features"] = inputs.input_features[0]
-            example["labels"] = labels[0]
+            batch["input_features"] = list(inputs.input_features)
+            batch["labels"] = labels
 
-            return example
+            return batch
 
-        return dataset.map(prepare_example, remove_columns=["audio"])
+        return dataset.map(
+            prepare_batch,
+            batched=True,
+            batch_size=self.config.preprocessing_batch_size,
+            num_proc=self.config.preprocessing_num_workers,
+            remove_columns=["audio"]
+        )
 
 class MedicalWhisperTrainer:
     """Fine-tuning trainer for medical Whisper models"""
@@ -331,8 +385,12 @@ class MedicalWhisperTrainer:
         self.processor = WhisperProcessor.from_pretrained(config.model_name, language=config.language)
         self.evaluator = MedicalTranscriptionEvaluator()
 
-        # Load model
-        self.model = WhisperForConditionalGeneration.from_pretrained(config.model_name)
+        # Load model with PyTorch's fused scaled-dot-product attention kernels
+        self.model = WhisperForConditionalGeneration.from_pretrained(config.model_name, attn_implementation="sdpa")
+
+        # A frozen encoder needs no gradients or optimizer state, roughly halving the backward pass
+        if config.freeze_encoder:
+            self.model.freeze_encoder()
 
         # Resize token embeddings if vocabulary was enhanced
         enhanced_tokenizer_path = os.path.join(config.output_dir, "enhanced_tokenizer")
@@ -345,6 +403,14 @@ class MedicalWhisperTrainer:
         """Train the medical Whisper model"""
         logger.info("Starting medical Whisper fine-tuning...")
 
+        # Mixed precision: bf16 where the GPU supports it, fp16 on other GPUs
+        use_bf16 = torch.cuda.is_available() and torch.cuda.is_bf16_supported()
+
+        # Recomputing activations only pays off when they would not fit in memory
+        gradient_checkpointing = self.config.gradient_checkpointing
+        if gradient_checkpointing is None:
+            gradient_checkpointing = self.config.batch_size > 16 or "large" in self.config.model_name
+
         # Training arguments
         training_args = TrainingArguments(
             output_dir=self.config.output_dir,
@@ -363,10 +429,15 @@ class MedicalWhisperTrainer:
             greater_is_better=False,  # Lower WER is better
             push_to_hub=False,
             report_to=["tensorboard"],
-            dataloader_num_workers=4,
-            fp16=torch.cuda.is_available(),
-            gradient_checkpointing=True,
+            dataloader_num_workers=min(8, os.cpu_count() or 4),
+            dataloader_pin_memory=True,
+            dataloader_persistent_workers=True,
+            dataloader_prefetch_factor=4,
+            bf16=use_bf16,
+            fp16=torch.cuda.is_available() and not use_bf16,
+            gradient_checkpointing=gradient_checkpointing,
             remove_unused_columns=False,
+            torch_compile=self.config.torch_compile and torch.cuda.is_available(),
         )
 
         # Initialize trainer
@@ -397,12 +468,15 @@ class MedicalWhisperTrainer:
         """Compute medical-specific evaluation metrics"""
         predictions, labels = eval_pred
 
-        # Decode predictions and labels
-        decoded_preds = self.processor.batch_decode(predictions, skip_special_tokens=True)
-        decoded_labels = self.processor.batch_decode(labels, skip_special_tokens=True)
+        # Ignored label positions (-100) are not token ids; decode them as padding
+        labels = np.where(labels != -100, labels, self.processor.tokenizer.pad_token_id)
+
+        # Decode predictions and labels in one call; the rows may differ in length
+        decoded = self.processor.batch_decode(list(predictions) + list(labels), skip_special_tokens=True)
+        decoded_preds, decoded_labels = decoded[:len(predictions)], decoded[len(predictions):]
 
-        # Compute medical metrics
-        results = self.evaluator.evaluate_batch(decoded_preds, decoded_labels)
+        # Compute medical metrics, with the labels as references
+        results = self.evaluator.evaluate_batch(decoded_labels, decoded_preds)
 
         return {
             "medical_wer": results["medical_wer"],
@@ -467,15 +541,35 @@ def main():
     data_processor = MedicalDataProcessor(config)
     trainer_manager = MedicalWhisperTrainer(config)
 
-    # Load and prepare datasets
-    logger.info("Loading medical datasets...")
-    dataset_dict = data_processor.load_medical_datasets()
+    # Prepared features from an earlier run with the same settings and data skip loading,
+    # TTS and the mel transform
+    prepared_path = data_processor.prepared_cache_path()
 
-    # Prepare datasets for training
-    logger.info("Preparing datasets for training...")
-    dataset_dict["train"] = data_processor.prepare_dataset(dataset_dict["train"])
-    dataset_dict["validation"] = data_processor.prepare_dataset(dataset_dict["validation"])
-    dataset_dict["test"] = data_processor.prepare_dataset(dataset_dict["test"])
+    # Only the current settings and data are ever loaded again, so older caches and the
+    # leftovers of interrupted saves are removed
+    for stale_path in prepared_path.parent.glob("*"):
+        if stale_path != prepared_path:
+            logger.info(f"Removing stale prepared datasets in {stale_path}")
+            shutil.rmtree(stale_path, ignore_errors=True)
+
+    if prepared_path.is_dir():
+        logger.info(f"Loading prepared datasets from {prepared_path}")
+        dataset_dict = load_from_disk(str(prepared_path))
+    else:
+        # Load and prepare datasets
+        logger.info("Loading medical datasets...")
+        dataset_dict = data_processor.load_medical_datasets()
+
+        # Prepare datasets for training
+        logger.info("Preparing datasets for training...")
+        dataset_dict["train"] = data_processor.prepare_dataset(dataset_dict["train"])
+        dataset_dict["validation"] = data_processor.prepare_dataset(dataset_dict["validation"])
+        dataset_dict["test"] = data_processor.prepare_dataset(dataset_dict["test"])
+
+        # Save beside the cache and swap it in, so an interrupted run never leaves a partial cache
+        temp_path = prepared_path.with_name(f"{prepared_path.name}.{os.getpid()}.tmp")
+        dataset_dict.save_to_disk(str(temp_path))
+        os.replace(temp_path, prepared_path)
 
     # Train model
     logger.info("Starting training...")
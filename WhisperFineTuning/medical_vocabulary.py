@@ -14,58 +14,443 @@ This module significantly improves medical transcription accuracy by ensuring
 the model properly recognizes domain-specific terminology.
 """
 
+import os
 import re
+import sys
 import json
+import importlib.util
+import threading
+import multiprocessing
 import logging
-from typing import List, Dict, Set, Tuple, Optional
+from functools import lru_cache
+from typing import List, Dict, Set, FrozenSet, Tuple, Optional, Union, BinaryIO
 from pathlib import Path
-from dataclasses import dataclass
-from collections import defaultdict, Counter
+from dataclasses import dataclass, field
+from collections import defaultdict, Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 
 import requests
 import nltk
-from nltk.tokenize import word_tokenize
 from nltk.corpus import stopwords
 
+# Multi-pattern substring matching
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Arrow CSV parser; pandas imports it itself when asked to use it
+PYARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+# Fast JSON serialization for saved vocabularies
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Entity buckets reported by extract_medical_entities for each vocabulary category
+ENTITY_BUCKETS = {
+    "drugs": "medications",
+    "procedures": "procedures",
+    "pathology": "conditions",
+    "symptoms": "conditions",
+    "anatomy": "anatomy",
+    "measurements": "measurements",
+    "abbreviations": "abbreviations"
+}
+
+# Distinct texts whose vocabulary matches each enhancer remembers; templated and
+# repeated transcripts are common, and the scan dominates entity extraction
+ENTITY_MATCH_CACHE_SIZE = 1024
+
+# Dataset columns that hold conversation text
+DATASET_TEXT_COLUMNS = ['conversation', 'text', 'dialogue', 'transcript']
+
+# Patterns for medical terms in free text; each is scanned separately since matches may overlap
+MEDICAL_TEXT_PATTERNS = [
+    re.compile(r'\b\d+\s?(mg|ml|mcg|g|kg|cc|units?)\b', re.IGNORECASE),  # Dosages
+    re.compile(r'\b\d+\s?(mmHg|bpm|degrees?)\b', re.IGNORECASE),  # Measurements
+    re.compile(r'\b[A-Z]{2,6}\b', re.IGNORECASE),  # Medical abbreviations
+    re.compile(r'\b\w+itis\b', re.IGNORECASE),  # Inflammatory conditions
+    re.compile(r'\b\w+ectomy\b', re.IGNORECASE),  # Surgical procedures
+    re.compile(r'\b\w+oscopy\b', re.IGNORECASE),  # Diagnostic procedures
+]
+
+class TermMatcher:
+    """Finds which of a fixed set of lowercase terms occur as substrings of a text"""
+
+    def __init__(self, terms):
+        self.terms = sorted({term for term in terms if term})
+
+        # An Aho-Corasick automaton reports every (overlapping) term in one scan of the text
+        self._automaton = None
+        if AHOCORASICK_AVAILABLE and self.terms:
+            self._automaton = ahocorasick.Automaton()
+            for term in self.terms:
+                self._automaton.add_word(term, term)
+            self._automaton.make_automaton()
+
+    def find(self, text_lower: str) -> Set[str]:
+        """Return the terms contained in text_lower"""
+        if self._automaton is not None:
+            return {term for _, term in self._automaton.iter(text_lower)}
+        return {term for term in self.terms if term in text_lower}
+
+# Curated vocabulary lists, built once at import
+
+# Common drug names
+COMMON_DRUGS = (
+    # Pain medications
+    "acetaminophen", "ibuprofen", "aspirin", "naproxen", "tramadol", "oxycodone",
+    "hydrocodone", "codeine", "morphine", "fentanyl", "celecoxib",
+
+    # Antibiotics
+    "amoxicillin", "azithromycin", "cephalexin", "ciprofloxacin", "clindamycin",
+    "doxycycline", "erythromycin", "levofloxacin", "metronidazole", "penicillin",
+    "trimethoprim", "sulfamethoxazole", "vancomycin", "ceftriaxone",
+
+    # Cardiovascular
+    "amlodipine", "atenolol", "carvedilol", "enalapril", "furosemide", "hydrochlorothiazide",
+    "lisinopril", "losartan", "metoprolol", "propranolol", "simvastatin", "atorvastatin",
+    "warfarin", "clopidogrel", "aspirin", "digoxin", "amiodarone",
+
+    # Diabetes
+    "metformin", "insulin", "glipizide", "glyburide", "pioglitazone", "sitagliptin",
+    "empagliflozin", "liraglutide", "semaglutide",
+
+    # Mental health
+    "sertraline", "fluoxetine", "escitalopram", "citalopram", "paroxetine", "venlafaxine",
+    "duloxetine", "bupropion", "trazodone", "lorazepam", "alprazolam", "clonazepam",
+    "diazepam", "quetiapine", "risperidone", "aripiprazole", "lithium",
+
+    # Respiratory
+    "albuterol", "montelukast", "fluticasone", "budesonide", "prednisone", "prednisolone",
+    "methylprednisolone", "dexamethasone",
+
+    # Gastrointestinal
+    "omeprazole", "lansoprazole", "esomeprazole", "ranitidine", "famotidine",
+    "metoclopramide", "ondansetron", "loperamide", "docusate"
+)
+
+# Brand names and their generic equivalents
+BRAND_GENERIC_PAIRS = {
+    "Tylenol": "acetaminophen",
+    "Advil": "ibuprofen",
+    "Motrin": "ibuprofen",
+    "Aleve": "naproxen",
+    "Lipitor": "atorvastatin",
+    "Crestor": "rosuvastatin",
+    "Nexium": "esomeprazole",
+    "Prilosec": "omeprazole",
+    "Zoloft": "sertraline",
+    "Prozac": "fluoxetine",
+    "Xanax": "alprazolam",
+    "Ativan": "lorazepam",
+    "Glucophage": "metformin",
+    "Lantus": "insulin glargine",
+    "Humalog": "insulin lispro"
+}
+
+# Medical procedures and treatments
+PROCEDURE_TERMS = (
+    # Diagnostic procedures
+    "endoscopy", "colonoscopy", "bronchoscopy", "cystoscopy", "arthroscopy",
+    "laparoscopy", "thoracoscopy", "hysteroscopy",
+
+    # Imaging
+    "radiography", "ultrasonography", "echocardiography", "mammography",
+    "angiography", "myelography", "arthrography", "tomography",
+    "CT scan", "MRI scan", "PET scan", "SPECT scan",
+
+    # Surgical procedures
+    "appendectomy", "cholecystectomy", "nephrectomy", "hysterectomy",
+    "mastectomy", "prostatectomy", "tonsillectomy", "thyroidectomy",
+    "craniotomy", "thoracotomy", "laparotomy", "arthrotomy",
+
+    # Cardiac procedures
+    "angioplasty", "stenting", "bypass", "catheterization", "ablation",
+    "pacemaker", "defibrillator", "valvuloplasty", "endarterectomy",
+
+    # Therapeutic procedures
+    "intubation", "tracheostomy", "dialysis", "chemotherapy", "radiotherapy",
+    "physiotherapy", "occupational therapy", "speech therapy",
+
+    # Minor procedures
+    "biopsy", "injection", "aspiration", "drainage", "suture", "cauterization",
+    "cryotherapy", "electrocautery", "laser therapy"
+)
+
+# Anatomical terms and body parts
+ANATOMICAL_TERMS = (
+    # Cardiovascular system
+    "myocardium", "pericardium", "endocardium", "septum", "ventricle", "atrium",
+    "aorta", "vena cava", "pulmonary", "coronary", "carotid", "femoral",
+
+    # Respiratory system
+    "alveoli", "bronchi", "bronchioles", "trachea", "larynx", "pharynx",
+    "diaphragm", "pleura", "mediastinum",
+
+    # Digestive system
+    "esophagus", "duodenum", "jejunum", "ileum", "cecum", "appendix",
+    "hepatic", "pancreatic", "gallbladder", "sphincter",
+
+    # Nervous system
+    "cerebrum", "cerebellum", "brainstem", "meninges", "ventricles",
+    "hippocampus", "amygdala", "thalamus", "hypothalamus", "pituitary",
+
+    # Musculoskeletal system
+    "vertebrae", "thoracic", "lumbar", "cervical", "sacral", "coccyx",
+    "sternum", "ribs", "scapula", "clavicle", "humerus", "radius", "ulna",
+    "femur", "tibia", "fibula", "patella",
+
+    # Urogenital system
+    "nephron", "glomerulus", "tubules", "ureter", "bladder", "urethra",
+    "prostate", "ovaries", "fallopian", "uterus", "cervix", "vagina"
+)
+
+# Diseases and pathological conditions
+PATHOLOGICAL_TERMS = (
+    # Cardiovascular diseases
+    "myocardial infarction", "angina pectoris", "arrhythmia", "bradycardia",
+    "tachycardia", "hypertension", "hypotension", "atherosclerosis",
+    "thrombosis", "embolism", "ischemia", "cardiomyopathy",
+
+    # Respiratory diseases
+    "pneumonia", "bronchitis", "asthma", "COPD", "emphysema", "pneumothorax",
+    "pulmonary edema", "respiratory failure", "bronchospasm",
+
+    # Gastrointestinal diseases
+    "gastritis", "peptic ulcer", "gastroesophageal reflux", "cholecystitis",
+    "hepatitis", "cirrhosis", "pancreatitis", "inflammatory bowel disease",
+    "Crohn's disease", "ulcerative colitis",
+
+    # Neurological diseases
+    "stroke", "transient ischemic attack", "seizure", "epilepsy", "migraine",
+    "Parkinson's disease", "Alzheimer's disease", "multiple sclerosis",
+    "neuropathy", "encephalitis", "meningitis",
+
+    # Infectious diseases
+    "sepsis", "bacteremia", "cellulitis", "pneumonia", "urinary tract infection",
+    "endocarditis", "osteomyelitis", "abscess",
+
+    # Endocrine diseases
+    "diabetes mellitus", "hypothyroidism", "hyperthyroidism", "Cushing's syndrome",
+    "Addison's disease", "hyperglycemia", "hypoglycemia"
+)
+
+# Clinical measurements and units
+MEASUREMENT_TERMS = (
+    # Vital signs
+    "blood pressure", "heart rate", "respiratory rate", "temperature",
+    "oxygen saturation", "pulse oximetry", "SpO2",
+
+    # Laboratory values
+    "hemoglobin", "hematocrit", "white blood cell count", "platelet count",
+    "glucose", "creatinine", "BUN", "electrolytes", "sodium", "potassium",
+    "chloride", "CO2", "troponin", "CPK", "LDH", "ALT", "AST",
+    "bilirubin", "alkaline phosphatase", "albumin", "protein",
+
+    # Units
+    "mmHg", "bpm", "mg/dL", "g/dL", "mEq/L", "mmol/L", "U/L", "ng/mL",
+    "pg/mL", "IU/L", "celsius", "fahrenheit", "kilograms", "pounds",
+    "centimeters", "inches", "milliliters", "liters"
+)
+
+# Medical abbreviations and what they stand for
+MEDICAL_ABBREVIATIONS = {
+    # Vital signs and measurements
+    "BP": "blood pressure",
+    "HR": "heart rate",
+    "RR": "respiratory rate",
+    "T": "temperature",
+    "O2 sat": "oxygen saturation",
+    "BMI": "body mass index",
+
+    # Laboratory tests
+    "CBC": "complete blood count",
+    "CMP": "comprehensive metabolic panel",
+    "BMP": "basic metabolic panel",
+    "LFT": "liver function tests",
+    "ABG": "arterial blood gas",
+    "UA": "urinalysis",
+    "ESR": "erythrocyte sedimentation rate",
+    "CRP": "C-reactive protein",
+    "PT": "prothrombin time",
+    "PTT": "partial thromboplastin time",
+    "INR": "international normalized ratio",
+
+    # Imaging
+    "CXR": "chest X-ray",
+    "CT": "computed tomography",
+    "MRI": "magnetic resonance imaging",
+    "US": "ultrasound",
+    "Echo": "echocardiogram",
+    "EKG": "electrocardiogram",
+    "ECG": "electrocardiogram",
+    "EEG": "electroencephalogram",
+
+    # Medical conditions
+    "HTN": "hypertension",
+    "DM": "diabetes mellitus",
+    "CAD": "coronary artery disease",
+    "CHF": "congestive heart failure",
+    "COPD": "chronic obstructive pulmonary disease",
+    "UTI": "urinary tract infection",
+    "DVT": "deep vein thrombosis",
+    "PE": "pulmonary embolism",
+    "MI": "myocardial infarction",
+    "TIA": "transient ischemic attack",
+    "CVA": "cerebrovascular accident",
+
+    # Routes and frequencies
+    "PO": "by mouth",
+    "IV": "intravenous",
+    "IM": "intramuscular",
+    "SQ": "subcutaneous",
+    "BID": "twice daily",
+    "TID": "three times daily",
+    "QID": "four times daily",
+    "PRN": "as needed",
+    "QHS": "at bedtime",
+    "NPO": "nothing by mouth"
+}
+
+# Symptoms and complaints
+SYMPTOM_TERMS = (
+    # Pain descriptors
+    "sharp", "dull", "throbbing", "stabbing", "burning", "aching",
+    "cramping", "shooting", "radiating", "constant", "intermittent",
+
+    # General symptoms
+    "fatigue", "weakness", "malaise", "fever", "chills", "sweats",
+    "nausea", "vomiting", "diarrhea", "constipation", "headache",
+    "dizziness", "vertigo", "syncope", "palpitations",
+
+    # Respiratory symptoms
+    "dyspnea", "shortness of breath", "wheezing", "cough", "sputum",
+    "hemoptysis", "chest pain", "pleuritic",
+
+    # Gastrointestinal symptoms
+    "abdominal pain", "bloating", "heartburn", "regurgitation",
+    "dysphagia", "odynophagia", "melena", "hematochezia",
+
+    # Neurological symptoms
+    "confusion", "memory loss", "seizure", "tremor", "numbness",
+    "tingling", "weakness", "paralysis", "aphasia", "dysarthria",
+
+    # Psychiatric symptoms
+    "anxiety", "depression", "insomnia", "hallucinations",
+    "delusions", "agitation", "mood changes"
+)
+
+# Medical specialties
+SPECIALTY_TERMS = (
+    "cardiology", "neurology", "pulmonology", "gastroenterology",
+    "endocrinology", "nephrology", "rheumatology", "hematology",
+    "oncology", "dermatology", "psychiatry", "pediatrics",
+    "geriatrics", "emergency medicine", "internal medicine",
+    "family medicine", "surgery", "anesthesiology", "radiology",
+    "pathology", "ophthalmology", "otolaryngology", "urology",
+    "gynecology", "obstetrics", "orthopedics", "plastic surgery"
+)
+
+# Usage contexts, one shared tuple for every entity loaded from the same list
+DRUG_CONTEXT = ("prescribed", "administered", "dosage", "mg", "ml")
+BRAND_CONTEXT = ("prescribed", "brand name")
+PROCEDURE_CONTEXT = ("performed", "underwent", "scheduled", "completed")
+ANATOMY_CONTEXT = ("examination", "palpation", "located", "region")
+PATHOLOGY_CONTEXT = ("diagnosed", "presents with", "history of", "symptoms")
+MEASUREMENT_CONTEXT = ("measured", "recorded", "elevated", "decreased", "normal")
+ABBREVIATION_CONTEXT = ("abbreviated", "stands for")
+SYMPTOM_CONTEXT = ("reports", "complains of", "experiences", "describes")
+SPECIALTY_CONTEXT = ("consultation", "referral", "specialist")
+
+# Slotted dataclasses (Python 3.10+) drop the per-instance __dict__ of the many vocabulary entities
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**DATACLASS_SLOTS)
 class MedicalEntity:
     """Represents a medical entity with metadata"""
     term: str
     category: str
     frequency: int = 0
-    synonyms: List[str] = None
-    context: List[str] = None
-
-    def __post_init__(self):
-        if self.synonyms is None:
-            self.synonyms = []
-        if self.context is None:
-            self.context = []
+    synonyms: List[str] = field(default_factory=list)
+    context: Tuple[str, ...] = ()
+
+@lru_cache(maxsize=None)
+def english_stop_words() -> FrozenSet[str]:
+    """NLTK's English stop words, fetched and loaded once per process"""
+    try:
+        nltk.data.find('corpora/stopwords')
+    except LookupError:
+        nltk.download('stopwords')
+
+    return frozenset(stopwords.words('english'))
+
+def count_text_terms(text: str) -> Counter:
+    """Count medical terms in free text"""
+    terms = Counter()
+
+    # Look for medical patterns; each has at most one group, so findall yields strings
+    for pattern in MEDICAL_TEXT_PATTERNS:
+        terms.update(pattern.findall(text))
+
+    return terms
+
+def count_csv_terms(csv_file: Path) -> Counter:
+    """Count medical terms in the text columns of one dataset CSV"""
+    import pandas as pd
+
+    try:
+        # Parse only the text columns this file has, with the Arrow parser if present
+        header = pd.read_csv(csv_file, nrows=0).columns
+        wanted = [col for col in DATASET_TEXT_COLUMNS if col in header]
+        if not wanted:
+            return Counter()
+
+        df = None
+        if PYARROW_AVAILABLE:
+            try:
+                df = pd.read_csv(csv_file, usecols=wanted, engine='pyarrow', dtype_backend='pyarrow')
+            except Exception as e:
+                logger.debug(f"Arrow CSV parser failed on {csv_file}, using pandas: {e}")
+        if df is None:
+            df = pd.read_csv(csv_file, usecols=wanted)
+
+        # Extract text from conversations
+        text_data = []
+
+        for col in DATASET_TEXT_COLUMNS:
+            if col in df.columns:
+                text_data.extend(df[col].dropna().astype(str).tolist())
+
+        # Scan the whole file's text at once; NUL separators are neither word
+        # characters nor whitespace, so no match can span two rows
+        return count_text_terms('\0'.join(text_data))
+
+    except Exception as e:
+        logger.warning(f"Could not process {csv_file}: {e}")
+        return Counter()
 
 class MedicalVocabularyEnhancer:
     """Enhances tokenizer vocabulary with medical terminology"""
 
-    def __init__(self, cache_dir: str = "./medical_vocab_cache"):
+    def __init__(self, cache_dir: str = "./medical_vocab_cache", skip_dataset_terms: bool = False):
+        # skip_dataset_terms skips mining terms from the medical datasets at construction;
+        # ingest only needs the curated gazetteer, and load_dataset_terms() can add the rest later
+        self.skip_dataset_terms = skip_dataset_terms
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
 
-        # Initialize NLTK components
-        try:
-            nltk.data.find('tokenizers/punkt')
-        except LookupError:
-            nltk.download('punkt')
-
-        try:
-            nltk.data.find('corpora/stopwords')
-        except LookupError:
-            nltk.download('stopwords')
-
-        self.stop_words = set(stopwords.words('english'))
+        self.stop_words = english_stop_words()
 
         # Load medical vocabularies
         self.medical_entities = self._load_comprehensive_medical_vocabulary()
+        self._build_entity_matcher()
 
     def _load_comprehensive_medical_vocabulary(self) -> Dict[str, List[MedicalEntity]]:
         """Load comprehensive medical vocabulary from multiple sources"""
@@ -83,8 +468,8 @@ class MedicalVocabularyEnhancer:
         }
 
         # Combine with terms from medical datasets
-        dataset_terms = self._extract_terms_from_medical_datasets()
-        vocabularies["dataset_derived"] = dataset_terms
+        if not self.skip_dataset_terms:
+            vocabularies["dataset_derived"] = self._extract_terms_from_medical_datasets()
 
         logger.info(f"Loaded medical vocabulary with {sum(len(v) for v in vocabularies.values())} terms")
         return vocabularies
@@ -93,72 +478,20 @@ class MedicalVocabularyEnhancer:
         """Load pharmaceutical drug names and medications"""
         drugs = []
 
-        # Common drug names
-        common_drugs = [
-            # Pain medications
-            "acetaminophen", "ibuprofen", "aspirin", "naproxen", "tramadol", "oxycodone",
-            "hydrocodone", "codeine", "morphine", "fentanyl", "celecoxib",
-
-            # Antibiotics
-            "amoxicillin", "azithromycin", "cephalexin", "ciprofloxacin", "clindamycin",
-            "doxycycline", "erythromycin", "levofloxacin", "metronidazole", "penicillin",
-            "trimethoprim", "sulfamethoxazole", "vancomycin", "ceftriaxone",
-
-            # Cardiovascular
-            "amlodipine", "atenolol", "carvedilol", "enalapril", "furosemide", "hydrochlorothiazide",
-            "lisinopril", "losartan", "metoprolol", "propranolol", "simvastatin", "atorvastatin",
-            "warfarin", "clopidogrel", "aspirin", "digoxin", "amiodarone",
-
-            # Diabetes
-            "metformin", "insulin", "glipizide", "glyburide", "pioglitazone", "sitagliptin",
-            "empagliflozin", "liraglutide", "semaglutide",
-
-            # Mental health
-            "sertraline", "fluoxetine", "escitalopram", "citalopram", "paroxetine", "venlafaxine",
-            "duloxetine", "bupropion", "trazodone", "lorazepam", "alprazolam", "clonazepam",
-            "diazepam", "quetiapine", "risperidone", "aripiprazole", "lithium",
-
-            # Respiratory
-            "albuterol", "montelukast", "fluticasone", "budesonide", "prednisone", "prednisolone",
-            "methylprednisolone", "dexamethasone",
-
-            # Gastrointestinal
-            "omeprazole", "lansoprazole", "esomeprazole", "ranitidine", "famotidine",
-            "metoclopramide", "ondansetron", "loperamide", "docusate"
-        ]
-
-        for drug in common_drugs:
+        # Aspirin is listed under two drug classes; register each drug once
+        for drug in dict.fromkeys(COMMON_DRUGS):
             drugs.append(MedicalEntity(
                 term=drug,
                 category="medication",
-                context=["prescribed", "administered", "dosage", "mg", "ml"]
+                context=DRUG_CONTEXT
             ))
 
-        # Add brand names and generic equivalents
-        brand_generic_pairs = {
-            "Tylenol": "acetaminophen",
-            "Advil": "ibuprofen",
-            "Motrin": "ibuprofen",
-            "Aleve": "naproxen",
-            "Lipitor": "atorvastatin",
-            "Crestor": "rosuvastatin",
-            "Nexium": "esomeprazole",
-            "Prilosec": "omeprazole",
-            "Zoloft": "sertraline",
-            "Prozac": "fluoxetine",
-            "Xanax": "alprazolam",
-            "Ativan": "lorazepam",
-            "Glucophage": "metformin",
-            "Lantus": "insulin glargine",
-            "Humalog": "insulin lispro"
-        }
-
-        for brand, generic in brand_generic_pairs.items():
+        for brand, generic in BRAND_GENERIC_PAIRS.items():
             drugs.append(MedicalEntity(
                 term=brand,
                 category="medication_brand",
                 synonyms=[generic],
-                context=["prescribed", "brand name"]
+                context=BRAND_CONTEXT
             ))
 
         return drugs
@@ -167,39 +500,11 @@ class MedicalVocabularyEnhancer:
         """Load medical procedures and treatments"""
         procedures = []
 
-        procedure_terms = [
-            # Diagnostic procedures
-            "endoscopy", "colonoscopy", "bronchoscopy", "cystoscopy", "arthroscopy",
-            "laparoscopy", "thoracoscopy", "hysteroscopy",
-
-            # Imaging
-            "radiography", "ultrasonography", "echocardiography", "mammography",
-            "angiography", "myelography", "arthrography", "tomography",
-            "CT scan", "MRI scan", "PET scan", "SPECT scan",
-
-            # Surgical procedures
-            "appendectomy", "cholecystectomy", "nephrectomy", "hysterectomy",
-            "mastectomy", "prostatectomy", "tonsillectomy", "thyroidectomy",
-            "craniotomy", "thoracotomy", "laparotomy", "arthrotomy",
-
-            # Cardiac procedures
-            "angioplasty", "stenting", "bypass", "catheterization", "ablation",
-            "pacemaker", "defibrillator", "valvuloplasty", "endarterectomy",
-
-            # Therapeutic procedures
-            "intubation", "tracheostomy", "dialysis", "chemotherapy", "radiotherapy",
-            "physiotherapy", "occupational therapy", "speech therapy",
-
-            # Minor procedures
-            "biopsy", "injection", "aspiration", "drainage", "suture", "cauterization",
-            "cryotherapy", "electrocautery", "laser therapy"
-        ]
-
-        for procedure in procedure_terms:
+        for procedure in PROCEDURE_TERMS:
             procedures.append(MedicalEntity(
                 term=procedure,
                 category="procedure",
-                context=["performed", "underwent", "scheduled", "completed"]
+                context=PROCEDURE_CONTEXT
             ))
 
         return procedures
@@ -208,38 +513,11 @@ class MedicalVocabularyEnhancer:
         """Load anatomical terms and body parts"""
         anatomy = []
 
-        anatomical_terms = [
-            # Cardiovascular system
-            "myocardium", "pericardium", "endocardium", "septum", "ventricle", "atrium",
-            "aorta", "vena cava", "pulmonary", "coronary", "carotid", "femoral",
-
-            # Respiratory system
-            "alveoli", "bronchi", "bronchioles", "trachea", "larynx", "pharynx",
-            "diaphragm", "pleura", "mediastinum",
-
-            # Digestive system
-            "esophagus", "duodenum", "jejunum", "ileum", "cecum", "appendix",
-            "hepatic", "pancreatic", "gallbladder", "sphincter",
-
-            # Nervous system
-            "cerebrum", "cerebellum", "brainstem", "meninges", "ventricles",
-            "hippocampus", "amygdala", "thalamus", "hypothalamus", "pituitary",
-
-            # Musculoskeletal system
-            "vertebrae", "thoracic", "lumbar", "cervical", "sacral", "coccyx",
-            "sternum", "ribs", "scapula", "clavicle", "humerus", "radius", "ulna",
-            "femur", "tibia", "fibula", "patella",
-
-            # Urogenital system
-            "nephron", "glomerulus", "tubules", "ureter", "bladder", "urethra",
-            "prostate", "ovaries", "fallopian", "uterus", "cervix", "vagina"
-        ]
-
-        for term in anatomical_terms:
+        for term in ANATOMICAL_TERMS:
             anatomy.append(MedicalEntity(
                 term=term,
                 category="anatomy",
-                context=["examination", "palpation", "located", "region"]
+                context=ANATOMY_CONTEXT
             ))
 
         return anatomy
@@ -248,40 +526,12 @@ class MedicalVocabularyEnhancer:
         """Load pathological conditions and diseases"""
         pathology = []
 
-        pathological_terms = [
-            # Cardiovascular diseases
-            "myocardial infarction", "angina pectoris", "arrhythmia", "bradycardia",
-            "tachycardia", "hypertension", "hypotension", "atherosclerosis",
-            "thrombosis", "embolism", "ischemia", "cardiomyopathy",
-
-            # Respiratory diseases
-            "pneumonia", "bronchitis", "asthma", "COPD", "emphysema", "pneumothorax",
-            "pulmonary edema", "respiratory failure", "bronchospasm",
-
-            # Gastrointestinal diseases
-            "gastritis", "peptic ulcer", "gastroesophageal reflux", "cholecystitis",
-            "hepatitis", "cirrhosis", "pancreatitis", "inflammatory bowel disease",
-            "Crohn's disease", "ulcerative colitis",
-
-            # Neurological diseases
-            "stroke", "transient ischemic attack", "seizure", "epilepsy", "migraine",
-            "Parkinson's disease", "Alzheimer's disease", "multiple sclerosis",
-            "neuropathy", "encephalitis", "meningitis",
-
-            # Infectious diseases
-            "sepsis", "bacteremia", "cellulitis", "pneumonia", "urinary tract infection",
-            "endocarditis", "osteomyelitis", "abscess",
-
-            # Endocrine diseases
-            "diabetes mellitus", "hypothyroidism", "hyperthyroidism", "Cushing's syndrome",
-            "Addison's disease", "hyperglycemia", "hypoglycemia"
-        ]
-
-        for term in pathological_terms:
+        # Register each condition once even if it appears under several headings
+        for term in dict.fromkeys(PATHOLOGICAL_TERMS):
             pathology.append(MedicalEntity(
                 term=term,
                 category="pathology",
-                context=["diagnosed", "presents with", "history of", "symptoms"]
+                context=PATHOLOGY_CONTEXT
             ))
 
         return pathology
@@ -290,28 +540,11 @@ class MedicalVocabularyEnhancer:
         """Load clinical measurements and units"""
         measurements = []
 
-        measurement_terms = [
-            # Vital signs
-            "blood pressure", "heart rate", "respiratory rate", "temperature",
-            "oxygen saturation", "pulse oximetry", "SpO2",
-
-            # Laboratory values
-            "hemoglobin", "hematocrit", "white blood cell count", "platelet count",
-            "glucose", "creatinine", "BUN", "electrolytes", "sodium", "potassium",
-            "chloride", "CO2", "troponin", "CPK", "LDH", "ALT", "AST",
-            "bilirubin", "alkaline phosphatase", "albumin", "protein",
-
-            # Units
-            "mmHg", "bpm", "mg/dL", "g/dL", "mEq/L", "mmol/L", "U/L", "ng/mL",
-            "pg/mL", "IU/L", "celsius", "fahrenheit", "kilograms", "pounds",
-            "centimeters", "inches", "milliliters", "liters"
-        ]
-
-        for term in measurement_terms:
+        for term in MEASUREMENT_TERMS:
             measurements.append(MedicalEntity(
                 term=term,
                 category="measurement",
-                context=["measured", "recorded", "elevated", "decreased", "normal"]
+                context=MEASUREMENT_CONTEXT
             ))
 
         return measurements
@@ -320,70 +553,12 @@ class MedicalVocabularyEnhancer:
         """Load medical abbreviations and acronyms"""
         abbreviations = []
 
-        abbrev_dict = {
-            # Vital signs and measurements
-            "BP": "blood pressure",
-            "HR": "heart rate",
-            "RR": "respiratory rate",
-            "T": "temperature",
-            "O2 sat": "oxygen saturation",
-            "BMI": "body mass index",
-
-            # Laboratory tests
-            "CBC": "complete blood count",
-            "CMP": "comprehensive metabolic panel",
-            "BMP": "basic metabolic panel",
-            "LFT": "liver function tests",
-            "ABG": "arterial blood gas",
-            "UA": "urinalysis",
-            "ESR": "erythrocyte sedimentation rate",
-            "CRP": "C-reactive protein",
-            "PT": "prothrombin time",
-            "PTT": "partial thromboplastin time",
-            "INR": "international normalized ratio",
-
-            # Imaging
-            "CXR": "chest X-ray",
-            "CT": "computed tomography",
-            "MRI": "magnetic resonance imaging",
-            "US": "ultrasound",
-            "Echo": "echocardiogram",
-            "EKG": "electrocardiogram",
-            "ECG": "electrocardiogram",
-            "EEG": "electroencephalogram",
-
-            # Medical conditions
-            "HTN": "hypertension",
-            "DM": "diabetes mellitus",
-            "CAD": "coronary artery disease",
-            "CHF": "congestive heart failure",
-            "COPD": "chronic obstructive pulmonary disease",
-            "UTI": "urinary tract infection",
-            "DVT": "deep vein thrombosis",
-            "PE": "pulmonary embolism",
-            "MI": "myocardial infarction",
-            "TIA": "transient ischemic attack",
-            "CVA": "cerebrovascular accident",
-
-            # Routes and frequencies
-            "PO": "by mouth",
-            "IV": "intravenous",
-            "IM": "intramuscular",
-            "SQ": "subcutaneous",
-            "BID": "twice daily",
-            "TID": "three times daily",
-            "QID": "four times daily",
-            "PRN": "as needed",
-            "QHS": "at bedtime",
-            "NPO": "nothing by mouth"
-        }
-
-        for abbrev, full_form in abbrev_dict.items():
+        for abbrev, full_form in MEDICAL_ABBREVIATIONS.items():
             abbreviations.append(MedicalEntity(
                 term=abbrev,
                 category="abbreviation",
                 synonyms=[full_form],
-                context=["abbreviated", "stands for"]
+                context=ABBREVIATION_CONTEXT
             ))
 
         return abbreviations
@@ -392,38 +567,12 @@ class MedicalVocabularyEnhancer:
         """Load symptom and complaint terms"""
         symptoms = []
 
-        symptom_terms = [
-            # Pain descriptors
-            "sharp", "dull", "throbbing", "stabbing", "burning", "aching",
-            "cramping", "shooting", "radiating", "constant", "intermittent",
-
-            # General symptoms
-            "fatigue", "weakness", "malaise", "fever", "chills", "sweats",
-            "nausea", "vomiting", "diarrhea", "constipation", "headache",
-            "dizziness", "vertigo", "syncope", "palpitations",
-
-            # Respiratory symptoms
-            "dyspnea", "shortness of breath", "wheezing", "cough", "sputum",
-            "hemoptysis", "chest pain", "pleuritic",
-
-            # Gastrointestinal symptoms
-            "abdominal pain", "bloating", "heartburn", "regurgitation",
-            "dysphagia", "odynophagia", "melena", "hematochezia",
-
-            # Neurological symptoms
-            "confusion", "memory loss", "seizure", "tremor", "numbness",
-            "tingling", "weakness", "paralysis", "aphasia", "dysarthria",
-
-            # Psychiatric symptoms
-            "anxiety", "depression", "insomnia", "hallucinations",
-            "delusions", "agitation", "mood changes"
-        ]
-
-        for term in symptom_terms:
+        # Register each symptom once even if it appears under several headings
+        for term in dict.fromkeys(SYMPTOM_TERMS):
             symptoms.append(MedicalEntity(
                 term=term,
                 category="symptom",
-                context=["reports", "complains of", "experiences", "describes"]
+                context=SYMPTOM_CONTEXT
             ))
 
         return symptoms
@@ -432,106 +581,152 @@ class MedicalVocabularyEnhancer:
         """Load medical specialty terms"""
         specialties = []
 
-        specialty_terms = [
-            "cardiology", "neurology", "pulmonology", "gastroenterology",
-            "endocrinology", "nephrology", "rheumatology", "hematology",
-            "oncology", "dermatology", "psychiatry", "pediatrics",
-            "geriatrics", "emergency medicine", "internal medicine",
-            "family medicine", "surgery", "anesthesiology", "radiology",
-            "pathology", "ophthalmology", "otolaryngology", "urology",
-            "gynecology", "obstetrics", "orthopedics", "plastic surgery"
-        ]
-
-        for term in specialty_terms:
+        for term in SPECIALTY_TERMS:
             specialties.append(MedicalEntity(
                 term=term,
                 category="specialty",
-                context=["consultation", "referral", "specialist"]
+                context=SPECIALTY_CONTEXT
             ))
 
         return specialties
 
     def _extract_terms_from_medical_datasets(self) -> List[MedicalEntity]:
         """Extract medical terms from existing medical datasets"""
-        dataset_terms = []
+        term_counts = Counter()
 
         # Try to load from MTS-Dialog dataset
         try:
-            from pathlib import Path
             mts_path = Path("../MedicalDatasets/MTS-Dialog")
 
             if mts_path.exists():
-                import pandas as pd
+                csv_files = sorted(mts_path.glob("*.csv"))
 
-                for csv_file in mts_path.glob("*.csv"):
-                    try:
-                        df = pd.read_csv(csv_file)
+                # Counts are cached in cache_dir and reused while no CSV has changed
+                sources = {str(csv_file): [csv_file.stat().st_mtime_ns, csv_file.stat().st_size]
+                           for csv_file in csv_files}
+                cache_path = self.cache_dir / "dataset_terms.json"
+                cached = self._load_dataset_terms_cache(cache_path)
 
-                        # Extract text from conversations
-                        text_columns = ['conversation', 'text', 'dialogue', 'transcript']
-                        text_data = []
-
-                        for col in text_columns:
-                            if col in df.columns:
-                                text_data.extend(df[col].dropna().tolist())
-
-                        # Extract medical terms from text
-                        for text in text_data:
-                            terms = self._extract_medical_terms_from_text(str(text))
-                            dataset_terms.extend(terms)
+                if cached is not None and cached["sources"] == sources:
+                    term_counts.update(dict(cached["terms"]))
+                else:
+                    term_counts = self._count_dataset_terms(csv_files)
 
-                    except Exception as e:
-                        logger.warning(f"Could not process {csv_file}: {e}")
+                    # Write through a temporary file so concurrent enhancers never read a partial cache
+                    temp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+                    with open(temp_path, 'w') as f:
+                        json.dump({"sources": sources, "terms": list(term_counts.items())}, f)
+                    os.replace(temp_path, cache_path)
 
         except Exception as e:
             logger.warning(f"Could not extract terms from medical datasets: {e}")
 
-        # Remove duplicates and return
-        unique_terms = {}
-        for term in dataset_terms:
-            if term.term not in unique_terms:
-                unique_terms[term.term] = term
-            else:
-                unique_terms[term.term].frequency += term.frequency
-
-        return list(unique_terms.values())
-
-    def _extract_medical_terms_from_text(self, text: str) -> List[MedicalEntity]:
-        """Extract medical terms from free text"""
-        terms = []
-
-        # Tokenize and clean text
-        tokens = word_tokenize(text.lower())
-        tokens = [token for token in tokens if token.isalpha() and token not in self.stop_words]
-
-        # Look for medical patterns
-        medical_patterns = [
-            r'\b\d+\s?(mg|ml|mcg|g|kg|cc|units?)\b',  # Dosages
-            r'\b\d+\s?(mmHg|bpm|degrees?)\b',  # Measurements
-            r'\b[A-Z]{2,6}\b',  # Medical abbreviations
-            r'\b\w+itis\b',  # Inflammatory conditions
-            r'\b\w+ectomy\b',  # Surgical procedures
-            r'\b\w+oscopy\b',  # Diagnostic procedures
-        ]
-
-        for pattern in medical_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                if isinstance(match, tuple):
-                    term = ' '.join(match)
-                else:
-                    term = match
+        # One entity per distinct term, carrying its total count
+        return [MedicalEntity(term=term, category="extracted", frequency=count)
+                for term, count in term_counts.items()]
 
-                terms.append(MedicalEntity(
-                    term=term,
-                    category="extracted",
-                    frequency=1
-                ))
-
-        return terms
-
-    def extract_medical_entities(self, text: str) -> Dict:
-        """Extract medical entities from text with categories"""
+    def _load_dataset_terms_cache(self, cache_path: Path) -> Optional[Dict]:
+        """Read cached dataset term counts, or None if absent or unreadable"""
+        try:
+            with open(cache_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _count_dataset_terms(self, csv_files: List[Path]) -> Counter:
+        """Count medical terms across the text columns of the given CSV files"""
+        term_counts = Counter()
+
+        # Files are independent, so several are parsed and scanned in parallel; an enhancer
+        # built inside a worker process counts serially rather than nesting another pool
+        workers = min(os.cpu_count() or 1, len(csv_files))
+        if workers > 1 and multiprocessing.parent_process() is None:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for file_counts in executor.map(count_csv_terms, csv_files):
+                    term_counts.update(file_counts)
+        else:
+            for csv_file in csv_files:
+                term_counts.update(count_csv_terms(csv_file))
+
+        return term_counts
+
+    def _extract_medical_terms_from_text(self, text: str) -> Counter:
+        """Count medical terms in free text"""
+        return count_text_terms(text)
+
+    def load_dataset_terms(self):
+        """Add the dataset-derived terms skipped by a skip_dataset_terms enhancer"""
+        if "dataset_derived" not in self.medical_entities:
+            self.medical_entities["dataset_derived"] = self._extract_terms_from_medical_datasets()
+            self._build_entity_matcher()
+
+    def _build_entity_matcher(self):
+        """Build the gazetteer used to find vocabulary terms in a single pass"""
+        self._entity_matcher = TermMatcher(entity.term.lower()
+                                           for entities in self.medical_entities.values()
+                                           for entity in entities)
+
+        # Matches for recently scanned texts; reset whenever the vocabulary changes
+        self._entity_match_cache = OrderedDict()
+        self._entity_match_lock = threading.Lock()
+
+        # Lowercased term -> (vocabulary position, bucket, term) for every bucketed entity,
+        # so matched terms map straight to their entities in vocabulary order. A term that
+        # feeds the same bucket from two categories (e.g. seizure as pathology and symptom)
+        # is only indexed the first time
+        self._entity_index = defaultdict(list)
+        indexed = set()
+        position = 0
+        for category, entities in self.medical_entities.items():
+            bucket = ENTITY_BUCKETS.get(category)
+            for entity in entities:
+                key = (bucket, entity.term.lower())
+                if bucket is not None and key not in indexed:
+                    indexed.add(key)
+                    self._entity_index[key[1]].append((position, bucket, entity.term))
+                position += 1
+
+    def _find_entity_terms(self, text_lower: str) -> FrozenSet[str]:
+        """Vocabulary terms in text_lower, remembered for recently scanned texts"""
+        # An OrderedDict LRU rather than functools.lru_cache keeps the enhancer picklable for
+        # datasets.map workers; the lock covers the TTS and prefetch threads that share an
+        # enhancer, and results are frozensets so no caller can alter a cached match
+        with self._entity_match_lock:
+            found_terms = self._entity_match_cache.get(text_lower)
+            if found_terms is not None:
+                self._entity_match_cache.move_to_end(text_lower)
+                return found_terms
+
+        # Scan outside the lock so threads only wait on the bookkeeping
+        found_terms = frozenset(self._entity_matcher.find(text_lower))
+        with self._entity_match_lock:
+            self._entity_match_cache[text_lower] = found_terms
+            if len(self._entity_match_cache) > ENTITY_MATCH_CACHE_SIZE:
+                self._entity_match_cache.popitem(last=False)
+        return found_terms
+
+    def __getstate__(self):
+        """Pickle without the match cache or its lock, which cannot be pickled"""
+        state = self.__dict__.copy()
+        state["_entity_match_cache"] = OrderedDict()
+        del state["_entity_match_lock"]
+        return state
+
+    def __setstate__(self, state):
+        """Restore a pickled enhancer with an empty match cache and its own lock"""
+        self.__dict__.update(state)
+        self._entity_match_lock = threading.Lock()
+
+    def vocabulary_terms(self) -> List[str]:
+        """Lowercased vocabulary terms that extract_medical_entities looks for"""
+        return self._entity_matcher.terms
+
+    def extract_medical_entities(self, text: str, found_terms: Optional[Set[str]] = None) -> Dict:
+        """Extract medical entities from text with categories
+
+        found_terms lets a caller that already matched the lowercased text against
+        vocabulary_terms() (possibly with extra terms of its own) skip the scan.
+        """
         entities = {
             "medications": [],
             "procedures": [],
@@ -541,44 +736,35 @@ class MedicalVocabularyEnhancer:
             "abbreviations": []
         }
 
-        text_lower = text.lower()
-
-        # Search for each category of medical terms
-        for category, medical_entities in self.medical_entities.items():
-            for entity in medical_entities:
-                if entity.term.lower() in text_lower:
-                    if category in ["drugs"]:
-                        entities["medications"].append(entity.term)
-                    elif category in ["procedures"]:
-                        entities["procedures"].append(entity.term)
-                    elif category in ["pathology", "symptoms"]:
-                        entities["conditions"].append(entity.term)
-                    elif category in ["anatomy"]:
-                        entities["anatomy"].append(entity.term)
-                    elif category in ["measurements"]:
-                        entities["measurements"].append(entity.term)
-                    elif category in ["abbreviations"]:
-                        entities["abbreviations"].append(entity.term)
+        if found_terms is None:
+            found_terms = self._find_entity_terms(text.lower())
+        if not found_terms:
+            return entities
+
+        # Look up the entities behind each matched term, keeping vocabulary order
+        matches = sorted(match for term in found_terms for match in self._entity_index.get(term, ()))
+        for _, bucket, term in matches:
+            entities[bucket].append(term)
 
         return entities
 
     def get_medical_terms(self, max_terms: int = 10000) -> List[str]:
         """Get list of medical terms for vocabulary enhancement"""
-        all_terms = []
-
-        for category, entities in self.medical_entities.items():
+        # Count terms and synonyms straight from the entities, without an intermediate list;
+        # terms repeat across entries (e.g. generics that are also brand synonyms)
+        term_counts = Counter()
+        for entities in self.medical_entities.values():
             for entity in entities:
-                all_terms.append(entity.term)
-                all_terms.extend(entity.synonyms)
+                term_counts[entity.term] += 1
+                term_counts.update(entity.synonyms)
 
         # Sort by frequency and relevance
-        term_counts = Counter(all_terms)
         sorted_terms = [term for term, count in term_counts.most_common(max_terms)]
 
         logger.info(f"Returning {len(sorted_terms)} medical terms for vocabulary enhancement")
         return sorted_terms
 
-    def get_contextual_terms(self, category: str) -> List[Tuple[str, List[str]]]:
+    def get_contextual_terms(self, category: str) -> List[Tuple[str, Tuple[str, ...]]]:
         """Get terms with their contextual usage patterns"""
         if category not in self.medical_entities:
             return []
@@ -589,8 +775,8 @@ class MedicalVocabularyEnhancer:
 
         return contextual_terms
 
-    def save_vocabulary(self, filepath: str):
-        """Save enhanced vocabulary to file"""
+    def save_vocabulary(self, filepath: Union[str, Path, BinaryIO]):
+        """Save enhanced vocabulary to a file path or a binary file object"""
         vocab_data = {}
 
         for category, entities in self.medical_entities.items():
@@ -604,15 +790,27 @@ class MedicalVocabularyEnhancer:
                     "context": entity.context
                 })
 
-        with open(filepath, 'w') as f:
-            json.dump(vocab_data, f, indent=2)
+        if ORJSON_AVAILABLE:
+            payload = orjson.dumps(vocab_data, option=orjson.OPT_INDENT_2)
+        else:
+            payload = json.dumps(vocab_data, indent=2).encode('utf-8')
+
+        if hasattr(filepath, 'write'):
+            filepath.write(payload)
+        else:
+            with open(filepath, 'wb') as f:
+                f.write(payload)
 
         logger.info(f"Medical vocabulary saved to {filepath}")
 
-    def load_vocabulary(self, filepath: str):
-        """Load enhanced vocabulary from file"""
-        with open(filepath, 'r') as f:
-            vocab_data = json.load(f)
+    def load_vocabulary(self, filepath: Union[str, Path, BinaryIO]):
+        """Load enhanced vocabulary from a file path or a binary file object"""
+        if hasattr(filepath, 'read'):
+            payload = filepath.read()
+        else:
+            with open(filepath, 'rb') as f:
+                payload = f.read()
+        vocab_data = orjson.loads(payload) if ORJSON_AVAILABLE else json.loads(payload)
 
         self.medical_entities = {}
         for category, entities_data in vocab_data.items():
@@ -623,10 +821,11 @@ class MedicalVocabularyEnhancer:
                     category=entity_data["category"],
                     frequency=entity_data["frequency"],
                     synonyms=entity_data.get("synonyms", []),
-                    context=entity_data.get("context", [])
+                    context=tuple(entity_data.get("context", ()))
                 )
                 self.medical_entities[category].append(entity)
 
+        self._build_entity_matcher()
         logger.info(f"Medical vocabulary loaded from {filepath}")
 
 def main():